@@ -5,11 +5,16 @@ Shared utilities for managing conversation states across the bot.
 """
 
 import logging
+import re
 from telegram import Update
 from telegram.ext import ContextTypes, ConversationHandler
 
 logger = logging.getLogger(__name__)
 
+# Plain decimal price: "2000", "-1.5", "1999.", ".5" (no exponent, no spaces).
+# Checked before float() so invalid input never goes through try/except.
+PRICE_RE = re.compile(r'^-?(?:\d+(?:\.\d*)?|\.\d+)$')
+
 
 async def cancel_conversation(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
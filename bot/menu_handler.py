@@ -15,10 +15,78 @@ from telegram import (
 )
 from telegram.ext import ContextTypes, ConversationHandler
 from telegram.error import BadRequest
+from functools import lru_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Static main menu, built once at import
+_MAIN_MENU_KB = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📊 Place Order", callback_data="menu_place_order")],
+    [
+        InlineKeyboardButton("📋 View Orders", callback_data="menu_view_orders"),
+        InlineKeyboardButton("💼 Positions", callback_data="menu_view_positions")
+    ],
+    [
+        InlineKeyboardButton("⚙️ Settings", callback_data="menu_settings"),
+        InlineKeyboardButton("🔧 More Commands", callback_data="menu_more_commands")
+    ]
+])
+# Static submenus, also built once
+_BACK_TO_MENU_KB = InlineKeyboardMarkup([
+    [InlineKeyboardButton("« Back to Menu", callback_data="menu_back")]
+])
+_TRADING_MENU_KB = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🟢 Limit Buy", callback_data="action_limitbuy")],
+    [InlineKeyboardButton("🔴 Limit Sell", callback_data="action_limitsell")],
+    [InlineKeyboardButton("« Back to Menu", callback_data="menu_back")]
+])
+_SETTINGS_MENU_KB = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📈 Risk Settings", callback_data="action_setrisktype")],
+    [InlineKeyboardButton("🎯 R:R Ratio", callback_data="action_setrr")],
+    [InlineKeyboardButton("📊 Symbol Config", callback_data="action_setsymbol")],
+    [InlineKeyboardButton("📋 View Settings", callback_data="action_settings")],
+    [InlineKeyboardButton("« Back to Menu", callback_data="menu_back")]
+])
+# Friendly names for action_* callbacks
+_ACTION_NAMES = {
+    "limitbuy": "🟢 Limit Buy Order",
+    "limitsell": "🔴 Limit Sell Order",
+    "setrisktype": "📈 Risk Settings",
+    "setrr": "🎯 R:R Ratio",
+    "setsymbol": "📊 Symbol Config",
+    "settings": "⚙️ View Settings"
+}
+_MENU_OPTIONS_TEXT = (
+    "• *Place Order* - Open new trade\n"
+    "• *View Orders* - Check pending orders\n"
+    "• *Positions* - View & close open trades\n"
+    "• *Settings* - Configure bot settings\n"
+    "• *More Commands* - View all commands"
+)
+_MAIN_MENU_TEXT = (
+    "📱 *MT5 Trading Assistant Menu*\n\n"
+    "👋 Vui lòng chọn menu:\n\n"
+    + _MENU_OPTIONS_TEXT
+)
+_WELCOME_TAIL_TEXT = (
+    "━━━━━━━━━━━━━━━━━━━━━\n\n"
+    "📱 *Main Menu*\n\n"
+    "Vui lòng chọn menu:\n\n"
+    + _MENU_OPTIONS_TEXT
+)
+
+
+@lru_cache(maxsize=16)
+def _action_keyboard(command: str) -> ReplyKeyboardMarkup:
+    """One-button reply keyboard that sends /<command> (memoized per command)"""
+    return ReplyKeyboardMarkup(
+        [[KeyboardButton(f"/{command}")]],
+        one_time_keyboard=True,  # Auto-hide after use
+        resize_keyboard=True,     # Compact size
+        input_field_placeholder=f"Tap to send /{command}"
+    )
+
 
 async def safe_edit_message(query, text, reply_markup=None, parse_mode='Markdown'):
     """
@@ -66,18 +134,7 @@ async def show_main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE, is_
         context: Context object
         is_new_user: If True, show welcome message for new users
     """
-    keyboard = [
-        [InlineKeyboardButton("📊 Place Order", callback_data="menu_place_order")],
-        [
-            InlineKeyboardButton("📋 View Orders", callback_data="menu_view_orders"),
-            InlineKeyboardButton("💼 Positions", callback_data="menu_view_positions")
-        ],
-        [
-            InlineKeyboardButton("⚙️ Settings", callback_data="menu_settings"),
-            InlineKeyboardButton("🔧 More Commands", callback_data="menu_more_commands")
-        ]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = _MAIN_MENU_KB
 
     # Add welcome message for new users
     if is_new_user:
@@ -85,25 +142,10 @@ async def show_main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE, is_
         message_text = (
             f"👋 *Welcome to MT5 Trading Assistant!*\n\n"
             f"Hi {first_name}, your account has been created. Let's get started! 🚀\n\n"
-            "━━━━━━━━━━━━━━━━━━━━━\n\n"
-            "📱 *Main Menu*\n\n"
-            "Vui lòng chọn menu:\n\n"
-            "• *Place Order* - Open new trade\n"
-            "• *View Orders* - Check pending orders\n"
-            "• *Positions* - View & close open trades\n"
-            "• *Settings* - Configure bot settings\n"
-            "• *More Commands* - View all commands"
+            + _WELCOME_TAIL_TEXT
         )
     else:
-        message_text = (
-            "📱 *MT5 Trading Assistant Menu*\n\n"
-            "👋 Vui lòng chọn menu:\n\n"
-            "• *Place Order* - Open new trade\n"
-            "• *View Orders* - Check pending orders\n"
-            "• *Positions* - View & close open trades\n"
-            "• *Settings* - Configure bot settings\n"
-            "• *More Commands* - View all commands"
-        )
+        message_text = _MAIN_MENU_TEXT
 
     # Try to edit message if from callback, otherwise send new message
     if update.callback_query:
@@ -127,25 +169,16 @@ async def handle_menu_callback(update: Update, context: ContextTypes.DEFAULT_TYP
 
     if data == "menu_place_order":
         # Show trading submenu
-        keyboard = [
-            [InlineKeyboardButton("🟢 Limit Buy", callback_data="action_limitbuy")],
-            [InlineKeyboardButton("🔴 Limit Sell", callback_data="action_limitsell")],
-            [InlineKeyboardButton("« Back to Menu", callback_data="menu_back")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
         await safe_edit_message(
             query,
             "📊 *Trading Menu*\n\n"
             "Select order type:",
-            reply_markup
+            _TRADING_MENU_KB
         )
 
     elif data == "menu_view_orders":
         # Trigger /orders command
         await safe_edit_message(query, "Loading pending orders...")
-        # Import here to avoid circular dependency
-        from bot.order_commands import orders_command
         # Create a fake message update to trigger orders_command
         context.user_data['menu_return'] = True
         # Send orders command output
@@ -161,8 +194,6 @@ async def handle_menu_callback(update: Update, context: ContextTypes.DEFAULT_TYP
     elif data == "menu_view_positions":
         # Trigger /positions command
         await safe_edit_message(query, "Loading open positions...")
-        # Import here to avoid circular dependency
-        from bot.position_commands import positions_command
         # Send positions command info
         await query.message.reply_text(
             "Use /positions command to view all open positions.\n\n"
@@ -172,20 +203,11 @@ async def handle_menu_callback(update: Update, context: ContextTypes.DEFAULT_TYP
 
     elif data == "menu_settings":
         # Show settings menu
-        keyboard = [
-            [InlineKeyboardButton("📈 Risk Settings", callback_data="action_setrisktype")],
-            [InlineKeyboardButton("🎯 R:R Ratio", callback_data="action_setrr")],
-            [InlineKeyboardButton("📊 Symbol Config", callback_data="action_setsymbol")],
-            [InlineKeyboardButton("📋 View Settings", callback_data="action_settings")],
-            [InlineKeyboardButton("« Back to Menu", callback_data="menu_back")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
         await safe_edit_message(
             query,
             "⚙️ *Settings Menu*\n\n"
             "Configure your trading settings:",
-            reply_markup
+            _SETTINGS_MENU_KB
         )
 
     elif data == "menu_more_commands":
@@ -221,11 +243,9 @@ async def handle_menu_callback(update: Update, context: ContextTypes.DEFAULT_TYP
             "/cancel - Cancel current operation"
         )
         # Add back button
-        keyboard = [[InlineKeyboardButton("« Back to Menu", callback_data="menu_back")]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
         await query.message.reply_text(
             "Use /start to return to menu",
-            reply_markup=reply_markup
+            reply_markup=_BACK_TO_MENU_KB
         )
 
     elif data == "menu_back":
@@ -237,24 +257,10 @@ async def handle_menu_callback(update: Update, context: ContextTypes.DEFAULT_TYP
         command = data.replace("action_", "")
 
         # Get friendly command name
-        command_names = {
-            "limitbuy": "🟢 Limit Buy Order",
-            "limitsell": "🔴 Limit Sell Order",
-            "setrisktype": "📈 Risk Settings",
-            "setrr": "🎯 R:R Ratio",
-            "setsymbol": "📊 Symbol Config",
-            "settings": "⚙️ View Settings"
-        }
-        friendly_name = command_names.get(command, command.title())
-
-        # Create reply keyboard with command button
-        keyboard = [[KeyboardButton(f"/{command}")]]
-        reply_markup = ReplyKeyboardMarkup(
-            keyboard,
-            one_time_keyboard=True,  # Auto-hide after use
-            resize_keyboard=True,     # Compact size
-            input_field_placeholder=f"Tap to send /{command}"
-        )
+        friendly_name = _ACTION_NAMES.get(command, command.title())
+
+        # Reply keyboard with command button
+        reply_markup = _action_keyboard(command)
 
         # Edit menu message
         await safe_edit_message(
@@ -277,5 +283,4 @@ async def handle_command_with_menu(command_name: str):
     Usage:
         After a command completes, show a button to return to menu.
     """
-    keyboard = [[InlineKeyboardButton("« Back to Menu", callback_data="menu_back")]]
-    return InlineKeyboardMarkup(keyboard)
+    return _BACK_TO_MENU_KB
@@ -14,8 +14,9 @@ from telegram.ext import (
     filters,
     ContextTypes
 )
-from bot.conversation_utils import cancel_conversation, cancel_and_process_new_command
-from database.db_manager import DatabaseManager
+from bot.conversation_utils import PRICE_RE, cancel_conversation, cancel_and_process_new_command
+from bot.user_cache import get_user
+from bot.mt5_runner import run_mt5
 
 logger = logging.getLogger(__name__)
 
@@ -32,8 +33,8 @@ async def modifyorder_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     - /modifyorder <ticket> -> Directly modify specific order
     """
     telegram_id = update.effective_user.id
-    db = DatabaseManager()
-    user = db.get_user_by_telegram_id(telegram_id)
+    db = context.bot_data['db']
+    user = get_user(db, telegram_id)
 
     if not user:
         await update.message.reply_text("Please use /start first")
@@ -54,7 +55,7 @@ async def modifyorder_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         try:
             ticket = int(args[0])
             # Get order details
-            order = mt5_adapter.get_order_detail(ticket)
+            order = await run_mt5(mt5_adapter.get_order_detail, ticket)
 
             if not order:
                 await update.message.reply_text(f"❌ Order {ticket} not found")
@@ -70,7 +71,7 @@ async def modifyorder_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
             return ConversationHandler.END
 
     # No ticket provided - show list of pending orders
-    pending_orders = mt5_adapter.get_pending_orders()
+    pending_orders = await run_mt5(mt5_adapter.get_pending_orders)
 
     if not pending_orders:
         await update.message.reply_text(
@@ -113,7 +114,7 @@ async def select_order(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     # Get order details
     mt5_adapter = context.bot_data.get('mt5_adapter')
-    order = mt5_adapter.get_order_detail(ticket)
+    order = await run_mt5(mt5_adapter.get_order_detail, ticket)
 
     if not order:
         await query.edit_message_text(f"❌ Order {ticket} not found or already filled")
@@ -222,70 +223,70 @@ async def select_field(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def receive_entry(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Receive new entry price"""
-    try:
-        new_entry = float(update.message.text)
-        context.user_data['new_entry'] = new_entry
-
-        # If modifying all, ask for SL next
-        if context.user_data.get('modify_field') == 'all':
-            order = context.user_data['modify_order']
-            await update.message.reply_text(
-                f"✅ Entry: {new_entry}\n\n"
-                f"Current SL: {order['sl']}\n\n"
-                f"Enter new *Stop Loss*:",
-                parse_mode='Markdown'
-            )
-            context.user_data['modify_step'] = 'sl'
-            return MODIFY_SL
-
-        # Single field modification - confirm
-        return await show_confirmation(update, context)
-
-    except ValueError:
+    text = update.message.text.strip()
+    if not PRICE_RE.match(text):
         await update.message.reply_text("❌ Invalid price. Please enter a number:")
         return MODIFY_ENTRY
 
+    new_entry = float(text)
+    context.user_data['new_entry'] = new_entry
+
+    # If modifying all, ask for SL next
+    if context.user_data.get('modify_field') == 'all':
+        order = context.user_data['modify_order']
+        await update.message.reply_text(
+            f"✅ Entry: {new_entry}\n\n"
+            f"Current SL: {order['sl']}\n\n"
+            f"Enter new *Stop Loss*:",
+            parse_mode='Markdown'
+        )
+        context.user_data['modify_step'] = 'sl'
+        return MODIFY_SL
+
+    # Single field modification - confirm
+    return await show_confirmation(update, context)
+
 
 async def receive_sl(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Receive new stop loss"""
-    try:
-        new_sl = float(update.message.text)
-        context.user_data['new_sl'] = new_sl
-
-        # If modifying all, ask for TP next
-        if context.user_data.get('modify_field') == 'all':
-            order = context.user_data['modify_order']
-            await update.message.reply_text(
-                f"✅ Entry: {context.user_data['new_entry']}\n"
-                f"✅ SL: {new_sl}\n\n"
-                f"Current TP: {order['tp']}\n\n"
-                f"Enter new *Take Profit*:",
-                parse_mode='Markdown'
-            )
-            context.user_data['modify_step'] = 'tp'
-            return MODIFY_TP
-
-        # Single field modification - confirm
-        return await show_confirmation(update, context)
-
-    except ValueError:
+    text = update.message.text.strip()
+    if not PRICE_RE.match(text):
         await update.message.reply_text("❌ Invalid price. Please enter a number:")
         return MODIFY_SL
 
+    new_sl = float(text)
+    context.user_data['new_sl'] = new_sl
 
-async def receive_tp(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Receive new take profit"""
-    try:
-        new_tp = float(update.message.text)
-        context.user_data['new_tp'] = new_tp
+    # If modifying all, ask for TP next
+    if context.user_data.get('modify_field') == 'all':
+        order = context.user_data['modify_order']
+        await update.message.reply_text(
+            f"✅ Entry: {context.user_data['new_entry']}\n"
+            f"✅ SL: {new_sl}\n\n"
+            f"Current TP: {order['tp']}\n\n"
+            f"Enter new *Take Profit*:",
+            parse_mode='Markdown'
+        )
+        context.user_data['modify_step'] = 'tp'
+        return MODIFY_TP
+
+    # Single field modification - confirm
+    return await show_confirmation(update, context)
 
-        # Show confirmation
-        return await show_confirmation(update, context)
 
-    except ValueError:
+async def receive_tp(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Receive new take profit"""
+    text = update.message.text.strip()
+    if not PRICE_RE.match(text):
         await update.message.reply_text("❌ Invalid price. Please enter a number:")
         return MODIFY_TP
 
+    new_tp = float(text)
+    context.user_data['new_tp'] = new_tp
+
+    # Show confirmation
+    return await show_confirmation(update, context)
+
 
 async def show_confirmation(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show confirmation before modifying order"""
@@ -362,7 +363,8 @@ async def execute_modification(update: Update, context: ContextTypes.DEFAULT_TYP
     await query.edit_message_text("⏳ Modifying order...")
 
     # Execute modification
-    result = mt5_adapter.modify_order(
+    result = await run_mt5(
+        mt5_adapter.modify_order,
         ticket=ticket,
         price=new_price,
         sl=new_sl,
@@ -0,0 +1,18 @@
+"""
+MT5 Call Runner
+
+Runs blocking MT5Adapter calls on a worker thread so the event loop keeps
+serving other chats. The MetaTrader5 package drives a single terminal
+session per process, so calls are serialized with one asyncio.Lock.
+"""
+
+import asyncio
+import functools
+
+_mt5_lock = asyncio.Lock()
+
+
+async def run_mt5(fn, *args, **kwargs):
+    """Await a blocking MT5 call off the event loop, one MT5 call at a time"""
+    async with _mt5_lock:
+        return await asyncio.to_thread(functools.partial(fn, *args, **kwargs))
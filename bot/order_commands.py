@@ -14,6 +14,8 @@ from telegram.ext import (
 )
 from datetime import datetime
 
+from bot.mt5_runner import run_mt5
+
 
 # Conversation states
 ORDER_DETAIL_SELECT = 0
@@ -37,7 +39,7 @@ async def orders_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     # Get pending orders - adapter handles connection automatically
-    pending_orders = adapter.get_pending_orders()
+    pending_orders = await run_mt5(adapter.get_pending_orders)
 
     if not pending_orders:
         await update.message.reply_text(
@@ -111,7 +113,7 @@ async def orderdetail_command(update: Update, context: ContextTypes.DEFAULT_TYPE
         )
         return
 
-    order_detail = adapter.get_order_detail(ticket)
+    order_detail = await run_mt5(adapter.get_order_detail, ticket)
 
     if not order_detail:
         await update.message.reply_text(
@@ -214,7 +216,7 @@ async def closeorder_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         )
         return
 
-    order_detail = adapter.get_order_detail(ticket)
+    order_detail = await run_mt5(adapter.get_order_detail, ticket)
 
     if not order_detail:
         await update.message.reply_text(
@@ -266,7 +268,7 @@ async def handle_order_action(update: Update, context: ContextTypes.DEFAULT_TYPE
     if data.startswith("refresh_order_"):
         ticket = int(data.replace("refresh_order_", ""))
 
-        order_detail = adapter.get_order_detail(ticket)
+        order_detail = await run_mt5(adapter.get_order_detail, ticket)
 
         if not order_detail:
             await query.edit_message_text(f"❌ Order {ticket} not found")
@@ -321,7 +323,7 @@ async def handle_order_action(update: Update, context: ContextTypes.DEFAULT_TYPE
     if data.startswith("close_order_"):
         ticket = int(data.replace("close_order_", ""))
 
-        order_detail = adapter.get_order_detail(ticket)
+        order_detail = await run_mt5(adapter.get_order_detail, ticket)
 
         if not order_detail:
             await query.edit_message_text(f"❌ Order {ticket} not found")
@@ -351,7 +353,7 @@ async def handle_order_action(update: Update, context: ContextTypes.DEFAULT_TYPE
         ticket = int(data.replace("confirm_close_order_", ""))
 
         # Close the order
-        result = adapter.close_pending_order(ticket)
+        result = await run_mt5(adapter.close_pending_order, ticket)
 
         if result['success']:
             await query.edit_message_text(
@@ -11,7 +11,8 @@ from telegram.ext import (
     CallbackQueryHandler,
     ContextTypes
 )
-from database.db_manager import DatabaseManager
+from bot.user_cache import get_user
+from bot.mt5_runner import run_mt5
 
 logger = logging.getLogger(__name__)
 
@@ -23,8 +24,8 @@ async def positions_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     Usage: /positions
     """
     telegram_id = update.effective_user.id
-    db = DatabaseManager()
-    user = db.get_user_by_telegram_id(telegram_id)
+    db = context.bot_data['db']
+    user = get_user(db, telegram_id)
 
     if not user:
         await update.message.reply_text("Please use /start first")
@@ -40,7 +41,7 @@ async def positions_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     # Get open positions
-    positions = mt5_adapter.get_open_positions()
+    positions = await run_mt5(mt5_adapter.get_open_positions)
 
     if not positions:
         await update.message.reply_text(
@@ -113,7 +114,7 @@ async def handle_position_action(update: Update, context: ContextTypes.DEFAULT_T
 
     if data == "refresh_positions":
         # Refresh position list
-        positions = mt5_adapter.get_open_positions()
+        positions = await run_mt5(mt5_adapter.get_open_positions)
 
         if not positions:
             await query.edit_message_text(
@@ -169,7 +170,7 @@ async def handle_position_action(update: Update, context: ContextTypes.DEFAULT_T
         ticket = int(data.replace("close_pos_", ""))
 
         # Get position details
-        position = mt5_adapter.get_position_detail(ticket)
+        position = await run_mt5(mt5_adapter.get_position_detail, ticket)
 
         if not position:
             await query.edit_message_text(
@@ -217,7 +218,7 @@ async def handle_position_action(update: Update, context: ContextTypes.DEFAULT_T
         )
 
         # Close position
-        result = mt5_adapter.close_position(ticket)
+        result = await run_mt5(mt5_adapter.close_position, ticket)
 
         if result['success']:
             profit_emoji = "🟢" if result['profit'] >= 0 else "🔴"
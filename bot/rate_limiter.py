@@ -0,0 +1,134 @@
+"""
+Outbound Rate Limiter
+
+Keeps Bot API calls under Telegram's flood limits (~30 messages/s overall,
+~1 message/s per private chat, 20 messages/min per group) and, when Telegram
+still answers with RetryAfter, pauses every outgoing request until the
+penalty has passed.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import timedelta
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Per-chat buckets kept before idle (fully refilled) ones are dropped
+MAX_TRACKED_CHATS = 10000
+
+
+class _TokenBucket:
+    """Async token bucket: `rate` tokens/second, bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+
+    async def acquire(self):
+        """Wait until a token is available, then take it"""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def is_idle(self, now: float) -> bool:
+        """True once the bucket has refilled completely (safe to forget)"""
+        return self._tokens + (now - self._last) * self.rate >= self.capacity
+
+
+class TokenBucketRateLimiter(BaseRateLimiter):
+    """
+    Rate limiter plugged into python-telegram-bot's Application.
+
+    Every Bot API request passes through process_request, so handlers keep
+    calling reply_text / edit_message_text as usual.
+    """
+
+    def __init__(self, overall_per_second: float = 30, group_per_minute: float = 20,
+                 private_per_second: float = 1, private_burst: float = 3,
+                 max_retries: int = 1):
+        """
+        Initialize rate limiter.
+
+        Args:
+            overall_per_second: Global request budget
+            group_per_minute: Budget per group/channel chat
+            private_per_second: Sustained budget per private chat
+            private_burst: Requests a private chat may send back to back
+                (e.g. "processing" edit followed by the result edit)
+            max_retries: Times to retry a request after RetryAfter
+        """
+        self._overall = _TokenBucket(overall_per_second, overall_per_second)
+        self._group_per_minute = group_per_minute
+        self._private_per_second = private_per_second
+        self._private_burst = private_burst
+        self._chat_buckets = {}
+        self._max_retries = max_retries
+        self._open = asyncio.Event()  # Cleared while a RetryAfter penalty is running
+        self._open.set()
+
+    async def initialize(self) -> None:
+        """Nothing to set up"""
+
+    async def shutdown(self) -> None:
+        """Nothing to tear down"""
+
+    def _chat_bucket(self, chat_id):
+        """
+        Bucket for the target chat, or None for requests without a chat.
+
+        Groups/channels (negative ids or @usernames) get the per-minute group
+        budget, private chats the per-second private budget.
+        """
+        if isinstance(chat_id, str) or (isinstance(chat_id, int) and chat_id < 0):
+            rate, capacity = self._group_per_minute / 60, self._group_per_minute
+        elif isinstance(chat_id, int):
+            rate, capacity = self._private_per_second, self._private_burst
+        else:
+            return None
+
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) >= MAX_TRACKED_CHATS:
+                self._drop_idle_buckets()
+            bucket = self._chat_buckets[chat_id] = _TokenBucket(rate, capacity)
+        return bucket
+
+    def _drop_idle_buckets(self):
+        """Forget chats whose buckets have fully refilled"""
+        now = time.monotonic()
+        for chat_id in [c for c, b in self._chat_buckets.items() if b.is_idle(now)]:
+            del self._chat_buckets[chat_id]
+
+    async def process_request(self, callback, args, kwargs, endpoint, data, rate_limit_args):
+        """Wait for budget, send the request, and back off on RetryAfter"""
+        chat_bucket = self._chat_bucket(data.get('chat_id'))
+
+        for attempt in range(self._max_retries + 1):
+            await self._open.wait()
+            if chat_bucket is not None:
+                await chat_bucket.acquire()
+            await self._overall.acquire()
+
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as e:
+                if attempt == self._max_retries:
+                    raise
+                delay = e.retry_after
+                if isinstance(delay, timedelta):
+                    delay = delay.total_seconds()
+                logger.warning("Flood limit hit on %s, pausing all requests for %ss", endpoint, delay)
+                self._open.clear()
+                await asyncio.sleep(delay)
+                self._open.set()
@@ -14,6 +14,8 @@ from telegram.ext import (
     ContextTypes
 )
 from bot.conversation_utils import cancel_conversation, cancel_and_process_new_command
+from bot.user_cache import get_user, get_settings, invalidate_settings
+from engine.symbol_resolver import SymbolResolver
 
 # Conversation states
 SYMBOL_BASE, SYMBOL_PREFIX, SYMBOL_SUFFIX = range(3)
@@ -23,6 +25,14 @@ RISKTYPE_TYPE = 7
 RISKTYPE_VALUE = 8
 RR_INPUT = 9
 
+# Stateless, shared by all preview handlers
+_symbol_resolver = SymbolResolver()
+
+
+def _is_skip(text: str) -> bool:
+    """Check for the 'skip' sentinel (case-insensitive), cheap length gate first"""
+    return len(text) == 4 and text.lower() == 'skip'
+
 
 # ==================== SET SYMBOL ====================
 
@@ -31,19 +41,19 @@ async def setsymbol_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = update.effective_user.id
     db = context.application.bot_data['db']
 
-    user = db.get_user_by_telegram_id(telegram_id)
+    user = get_user(db, telegram_id)
 
     if not user:
         await update.message.reply_text("❌ Please use /start first")
         return ConversationHandler.END
 
-    settings = db.get_user_settings(user['id'])
+    base, prefix, suffix = db.get_user_symbol_settings(user['id'])
     await update.message.reply_text(
         f"⚙️ Symbol Configuration\n\n"
         f"Current settings:\n"
-        f"Base: {settings['default_symbol_base']}\n"
-        f"Prefix: {settings['symbol_prefix'] or 'None'}\n"
-        f"Suffix: {settings['symbol_suffix'] or 'None'}\n\n"
+        f"Base: {base}\n"
+        f"Prefix: {prefix or 'None'}\n"
+        f"Suffix: {suffix or 'None'}\n\n"
         f"Enter new symbol base (e.g., XAU, EUR, GBP):"
     )
 
@@ -75,7 +85,7 @@ async def ask_symbol_suffix(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Ask for symbol suffix"""
     prefix = update.message.text.strip()
 
-    if prefix.lower() == 'skip':
+    if _is_skip(prefix):
         prefix = ''
 
     context.user_data['symbol_prefix'] = prefix
@@ -90,18 +100,15 @@ async def ask_symbol_suffix(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def save_symbol_settings(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Save symbol settings"""
-    from engine.symbol_resolver import SymbolResolver
-
     suffix = update.message.text.strip()
 
-    if suffix.lower() == 'skip':
+    if _is_skip(suffix):
         suffix = ''
 
     context.user_data['symbol_suffix'] = suffix
 
     # Preview symbol
-    resolver = SymbolResolver()
-    preview_symbol = resolver.resolve(
+    preview_symbol = _symbol_resolver.resolve(
         base=context.user_data['symbol_base'],
         prefix=context.user_data['symbol_prefix'],
         suffix=context.user_data['symbol_suffix']
@@ -110,7 +117,7 @@ async def save_symbol_settings(update: Update, context: ContextTypes.DEFAULT_TYP
     telegram_id = update.effective_user.id
     db = context.application.bot_data['db']
 
-    user = db.get_user_by_telegram_id(telegram_id)
+    user = get_user(db, telegram_id)
 
     # Update settings
     db.update_user_settings(
@@ -119,6 +126,7 @@ async def save_symbol_settings(update: Update, context: ContextTypes.DEFAULT_TYP
         symbol_prefix=context.user_data['symbol_prefix'],
         symbol_suffix=context.user_data['symbol_suffix']
     )
+    invalidate_settings(user['id'])
     await update.message.reply_text(
         f"✅ Symbol settings saved!\n\n"
         f"Base: {context.user_data['symbol_base']}\n"
@@ -156,16 +164,16 @@ async def setprefix_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = update.effective_user.id
     db = context.application.bot_data['db']
 
-    user = db.get_user_by_telegram_id(telegram_id)
+    user = get_user(db, telegram_id)
 
     if not user:
         await update.message.reply_text("❌ Please use /start first")
         return ConversationHandler.END
 
-    settings = db.get_user_settings(user['id'])
+    symbol_settings = db.get_user_symbol_settings(user['id'])
     await update.message.reply_text(
         f"⚙️ Configure Symbol Prefix\n\n"
-        f"Current prefix: {settings['symbol_prefix'] or 'None'}\n\n"
+        f"Current prefix: {symbol_settings.prefix or 'None'}\n\n"
         f"Enter new prefix (e.g., 'BROKER.' or type 'skip' to clear):"
     )
 
@@ -174,31 +182,29 @@ async def setprefix_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def save_prefix(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Save prefix setting"""
-    from engine.symbol_resolver import SymbolResolver
-
     prefix = update.message.text.strip()
 
-    if prefix.lower() == 'skip':
+    if _is_skip(prefix):
         prefix = ''
 
     telegram_id = update.effective_user.id
     db = context.application.bot_data['db']
 
-    user = db.get_user_by_telegram_id(telegram_id)
-    settings = db.get_user_settings(user['id'])
+    user = get_user(db, telegram_id)
+    base, _, suffix = db.get_user_symbol_settings(user['id'])
 
     # Update prefix only
     db.update_user_settings(
         user_id=user['id'],
         symbol_prefix=prefix
     )
+    invalidate_settings(user['id'])
 
     # Show preview
-    resolver = SymbolResolver()
-    preview_symbol = resolver.resolve(
-        base=settings['default_symbol_base'],
+    preview_symbol = _symbol_resolver.resolve(
+        base=base,
         prefix=prefix,
-        suffix=settings['symbol_suffix']
+        suffix=suffix
     )
     await update.message.reply_text(
         f"✅ Prefix updated!\n\n"
@@ -231,16 +237,16 @@ async def setsuffix_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = update.effective_user.id
     db = context.application.bot_data['db']
 
-    user = db.get_user_by_telegram_id(telegram_id)
+    user = get_user(db, telegram_id)
 
     if not user:
         await update.message.reply_text("❌ Please use /start first")
         return ConversationHandler.END
 
-    settings = db.get_user_settings(user['id'])
+    symbol_settings = db.get_user_symbol_settings(user['id'])
     await update.message.reply_text(
         f"⚙️ Configure Symbol Suffix\n\n"
-        f"Current suffix: {settings['symbol_suffix'] or 'None'}\n\n"
+        f"Current suffix: {symbol_settings.suffix or 'None'}\n\n"
         f"Enter new suffix (e.g., 'm', '.pro' or type 'skip' to clear):"
     )
 
@@ -249,30 +255,28 @@ async def setsuffix_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def save_suffix(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Save suffix setting"""
-    from engine.symbol_resolver import SymbolResolver
-
     suffix = update.message.text.strip()
 
-    if suffix.lower() == 'skip':
+    if _is_skip(suffix):
         suffix = ''
 
     telegram_id = update.effective_user.id
     db = context.application.bot_data['db']
 
-    user = db.get_user_by_telegram_id(telegram_id)
-    settings = db.get_user_settings(user['id'])
+    user = get_user(db, telegram_id)
+    base, prefix, _ = db.get_user_symbol_settings(user['id'])
 
     # Update suffix only
     db.update_user_settings(
         user_id=user['id'],
         symbol_suffix=suffix
     )
+    invalidate_settings(user['id'])
 
     # Show preview
-    resolver = SymbolResolver()
-    preview_symbol = resolver.resolve(
-        base=settings['default_symbol_base'],
-        prefix=settings['symbol_prefix'],
+    preview_symbol = _symbol_resolver.resolve(
+        base=base,
+        prefix=prefix,
         suffix=suffix
     )
     await update.message.reply_text(
@@ -306,13 +310,13 @@ async def setrisktype_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = update.effective_user.id
     db = context.application.bot_data['db']
 
-    user = db.get_user_by_telegram_id(telegram_id)
+    user = get_user(db, telegram_id)
 
     if not user:
         await update.message.reply_text("❌ Please use /start first")
         return ConversationHandler.END
 
-    settings = db.get_user_settings(user['id'])
+    settings = get_settings(db, user['id'])
     # Format current value for display
     if settings['risk_type'] == "fixed_usd":
         current_value_display = f"${settings['risk_value']}"
@@ -391,7 +395,7 @@ async def save_risktype_settings(update: Update, context: ContextTypes.DEFAULT_T
         telegram_id = update.effective_user.id
         db = context.application.bot_data['db']
 
-        user = db.get_user_by_telegram_id(telegram_id)
+        user = get_user(db, telegram_id)
 
         # Update settings
         db.update_user_settings(
@@ -399,6 +403,7 @@ async def save_risktype_settings(update: Update, context: ContextTypes.DEFAULT_T
             risk_type=risk_type,
             risk_value=risk_value
         )
+        invalidate_settings(user['id'])
         if risk_type == "fixed_usd":
             await update.message.reply_text(
                 f"✅ Risk settings saved!\n\n"
@@ -447,13 +452,13 @@ async def setrr_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = update.effective_user.id
     db = context.application.bot_data['db']
 
-    user = db.get_user_by_telegram_id(telegram_id)
+    user = get_user(db, telegram_id)
 
     if not user:
         await update.message.reply_text("❌ Please use /start first")
         return ConversationHandler.END
 
-    settings = db.get_user_settings(user['id'])
+    settings = get_settings(db, user['id'])
     # Handle sqlite3.Row object - check if column exists first
     column_missing = False
     try:
@@ -495,17 +500,10 @@ async def save_rr(update: Update, context: ContextTypes.DEFAULT_TYPE):
     try:
         rr_ratio = float(update.message.text)
 
-        # Validate R:R ratio
-        if rr_ratio <= 0:
-            await update.message.reply_text(
-                "❌ R:R ratio must be positive!\n\n"
-                "Enter a valid R:R ratio (e.g., 2, 2.5, 3):"
-            )
-            return RR_INPUT
-
-        if rr_ratio > 10:
+        # Validate R:R ratio (must be positive, max 10)
+        if not (0 < rr_ratio <= 10):
             await update.message.reply_text(
-                "❌ R:R ratio too high (max 10)!\n\n"
+                "❌ R:R ratio must be greater than 0 and at most 10!\n\n"
                 "Enter a realistic R:R ratio (e.g., 2, 2.5, 3):"
             )
             return RR_INPUT
@@ -513,19 +511,21 @@ async def save_rr(update: Update, context: ContextTypes.DEFAULT_TYPE):
         telegram_id = update.effective_user.id
         db = context.application.bot_data['db']
 
-        user = db.get_user_by_telegram_id(telegram_id)
+        user = get_user(db, telegram_id)
 
         # Update RR ratio
         db.update_user_settings(
             user_id=user['id'],
             default_rr_ratio=rr_ratio
         )
+        invalidate_settings(user['id'])
+        example_tp = 2000 + (5 * rr_ratio)
         await update.message.reply_text(
             f"✅ R:R ratio updated!\n\n"
             f"New R:R: {rr_ratio}:1\n\n"
             f"📊 Example:\n"
             f"If Entry=2000, SL=1995 (risk=5 points)\n"
-            f"→ TP will be auto-calculated: 2000 + (5 × {rr_ratio}) = {2000 + (5 * rr_ratio)}\n\n"
+            f"→ TP will be auto-calculated: 2000 + (5 × {rr_ratio}) = {example_tp}\n\n"
             f"Now when you place trades, TP will be calculated automatically!"
         )
 
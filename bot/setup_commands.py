@@ -4,6 +4,11 @@ Setup Management Commands
 Handles /addsetup, /editsetup, /deletesetup commands for managing trade setups.
 """
 
+import asyncio
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
     ConversationHandler,
@@ -14,6 +19,8 @@ from telegram.ext import (
     ContextTypes
 )
 from bot.conversation_utils import cancel_conversation, cancel_and_process_new_command
+from bot.user_cache import cached_user, get_user, invalidate_setups
+from database.db_manager import SETUP_FIELD_UPDATE_SQL, DEACTIVATE_SETUP_SQL
 
 # Conversation states for /addsetup
 SETUP_CODE, SETUP_NAME, SETUP_DESCRIPTION = range(3)
@@ -24,9 +31,162 @@ EDIT_SELECT, EDIT_FIELD, EDIT_VALUE = range(3, 6)
 # Conversation states for /deletesetup
 DELETE_SELECT, DELETE_CONFIRM = range(6, 8)
 
+# Input validators
+_CODE_RE = re.compile(r'^[A-Z0-9]{2,10}$')
+_NAME_RE = re.compile(r'^\S.{2,}', re.S)
+MAX_DESCRIPTION_LEN = 500  # Matches CHECK constraint in schema.sql
+
+
+@dataclass(slots=True)
+class AddSetupState:
+    """In-progress /addsetup answers"""
+    code: str = ''
+    name: str = ''
+
+
+@dataclass(slots=True)
+class SelectSetupState:
+    """In-progress /editsetup or /deletesetup selection"""
+    codes: dict = field(default_factory=dict)  # setup id -> setup code
+    setup_id: int = 0
+    code: str = ''
+    edit_field: str = ''
+
+
+# Static keyboards (built once at import)
+_EDIT_FIELD_KB = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📝 Edit Name", callback_data="field_name")],
+    [InlineKeyboardButton("📄 Edit Description", callback_data="field_description")],
+    [InlineKeyboardButton("❌ Cancel", callback_data="cancel")]
+])
+_DELETE_CONFIRM_KB = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("✅ Yes, Delete", callback_data="confirm_delete"),
+        InlineKeyboardButton("❌ Cancel", callback_data="cancel")
+    ]
+])
+
+
+async def _get_user_id(db, telegram_id: int, context: ContextTypes.DEFAULT_TYPE):
+    """
+    Resolve database user_id for a Telegram user.
+
+    Checks the conversation's user_data first, then the shared user cache,
+    and only then queries the database.
+
+    Returns:
+        user_id, or None if the user has not used /start
+    """
+    user_id = context.user_data.get('db_user_id')
+    if user_id is not None:
+        return user_id
+
+    user = cached_user(telegram_id)
+    if user is None:
+        user = await asyncio.to_thread(get_user, db, telegram_id)
+        if not user:
+            return None
+
+    context.user_data['db_user_id'] = user_id = user['id']
+    return user_id
+
+
+@lru_cache(maxsize=512)
+def _build_setup_keyboard(setups: tuple, mode: str) -> InlineKeyboardMarkup:
+    """
+    Build (and memoize) the setup selection keyboard.
+
+    Keyed by the setup rows themselves, so any add/edit/delete produces a new
+    key and stale keyboards are never served. Buttons carry the numeric setup id.
+
+    Args:
+        setups: Tuple of (id, setup_code, setup_name) tuples
+        mode: "edit" or "delete"
+    """
+    label_prefix = "🗑️ " if mode == "delete" else ""
+    keyboard = [
+        [InlineKeyboardButton(f"{label_prefix}{setup_code} - {setup_name}", callback_data=f"{mode}_{setup_id}")]
+        for setup_id, setup_code, setup_name in setups
+    ]
+
+    if mode == "delete":
+        keyboard.append([InlineKeyboardButton("❌ Cancel", callback_data="cancel")])
+
+    return InlineKeyboardMarkup(keyboard)
+
+
+def _selected_setup(context: ContextTypes.DEFAULT_TYPE, state_key: str, callback_data: str):
+    """
+    Record the setup picked from an edit/delete keyboard.
+
+    Args:
+        state_key: user_data key of the conversation's SelectSetupState
+
+    Returns:
+        The conversation's SelectSetupState, or None if the conversation
+        state is gone or the id is not one that was offered
+    """
+    state = context.user_data.get(state_key)
+    if not isinstance(state, SelectSetupState):
+        return None
+
+    setup_id = int(callback_data.split('_', 1)[1])  # Handler pattern guarantees "<mode>_<digits>"
+    setup_code = state.codes.get(setup_id)
+    if setup_code is None:
+        return None
+
+    state.setup_id, state.code = setup_id, setup_code
+    return state
+
+
+def _clean_field_value(field: str, value: str):
+    """
+    Validate a new value for an edited setup field.
+
+    'skip' clears the description; a name must pass _NAME_RE.
+
+    Returns:
+        (value to store, None) or (None, error message)
+    """
+    if field == "description":
+        return (None if value.lower() == 'skip' else value[:MAX_DESCRIPTION_LEN]), None
+    if not _NAME_RE.match(value):
+        return None, "❌ Setup name too short."
+    return value, None
+
+
+async def _selection_expired(query):
+    """Tell the user a stale keyboard was used and end the conversation"""
+    await query.edit_message_text("❌ This selection has expired. Please run the command again.")
+    return ConversationHandler.END
+
 
 async def addsetup_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Start /addsetup conversation"""
+    """
+    Start /addsetup conversation.
+
+    Power users can skip the conversation with `/addsetup CODE|Name|Description`
+    (description optional).
+    """
+    args = update.message.text.split(maxsplit=1)[1:]
+    parts = args[0].split('|', 2) if args else None
+    if parts and len(parts) >= 2:
+        setup_code = parts[0].strip().upper()
+        setup_name = parts[1].strip()
+        description = parts[2].strip()[:MAX_DESCRIPTION_LEN] if len(parts) == 3 else ""
+
+        if not _CODE_RE.match(setup_code):
+            await update.message.reply_text("❌ Setup code must be 2-10 letters or digits.")
+            return ConversationHandler.END
+        if not _NAME_RE.match(setup_name):
+            await update.message.reply_text("❌ Setup name too short.")
+            return ConversationHandler.END
+
+        await _create_setup(update, context, setup_code, setup_name, description or None)
+        return ConversationHandler.END
+
+    context.user_data['add_setup_state'] = AddSetupState()
+
     await update.message.reply_text(
         "📝 Add New Trade Setup\n\n"
         "Enter setup code (e.g., FZ1, TLP1, OB):\n"
@@ -39,14 +199,14 @@ async def ask_setup_name(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Ask for setup name"""
     setup_code = update.message.text.strip().upper()
 
-    if len(setup_code) < 2 or len(setup_code) > 10:
+    if not _CODE_RE.match(setup_code):
         await update.message.reply_text(
-            "❌ Setup code must be 2-10 characters.\n\n"
+            "❌ Setup code must be 2-10 letters or digits.\n\n"
             "Try again:"
         )
         return SETUP_CODE
 
-    context.user_data['setup_code'] = setup_code
+    context.user_data['add_setup_state'].code = setup_code
 
     await update.message.reply_text(
         f"Code: {setup_code}\n\n"
@@ -60,14 +220,14 @@ async def ask_setup_description(update: Update, context: ContextTypes.DEFAULT_TY
     """Ask for setup description"""
     setup_name = update.message.text.strip()
 
-    if len(setup_name) < 3:
+    if not _NAME_RE.match(setup_name):
         await update.message.reply_text(
             "❌ Setup name too short.\n\n"
             "Try again:"
         )
         return SETUP_NAME
 
-    context.user_data['setup_name'] = setup_name
+    context.user_data['add_setup_state'].name = setup_name
 
     await update.message.reply_text(
         f"Name: {setup_name}\n\n"
@@ -79,53 +239,58 @@ async def ask_setup_description(update: Update, context: ContextTypes.DEFAULT_TY
 
 async def save_setup(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Save the setup to database"""
-    description = update.message.text.strip()
+    description = update.message.text.strip()[:MAX_DESCRIPTION_LEN]
 
     if description.lower() == 'skip':
         description = None
 
+    state = context.user_data['add_setup_state']
+    await _create_setup(update, context, state.code, state.name, description)
+    return ConversationHandler.END
+
+
+async def _create_setup(update: Update, context: ContextTypes.DEFAULT_TYPE,
+                        setup_code: str, setup_name: str, description):
+    """Insert a validated setup and report the result to the user"""
     # Get shared database from bot context
     telegram_id = update.effective_user.id
     db = context.application.bot_data['db']
 
-    user = db.get_user_by_telegram_id(telegram_id)
+    user_id = await _get_user_id(db, telegram_id, context)
 
-    if not user:
+    if not user_id:
         await update.message.reply_text("❌ Please use /start first")
-        return ConversationHandler.END
+        return
 
     # Check if setup code already exists
-    setups = db.get_user_setups(user['id'], active_only=False)
-    existing_codes = [s['setup_code'] for s in setups]
-
-    if context.user_data['setup_code'] in existing_codes:
+    if await asyncio.to_thread(db.setup_code_exists, user_id, setup_code):
         await update.message.reply_text(
-            f"❌ Setup code '{context.user_data['setup_code']}' already exists!\n\n"
+            f"❌ Setup code '{setup_code}' already exists!\n\n"
             f"Choose a different code."
         )
-        return ConversationHandler.END
+        return
 
     # Create setup
     try:
-        db.create_setup(
-            user_id=user['id'],
-            setup_code=context.user_data['setup_code'],
-            setup_name=context.user_data['setup_name'],
+        await asyncio.to_thread(
+            db.create_setup,
+            user_id=user_id,
+            setup_code=setup_code,
+            setup_name=setup_name,
             description=description
         )
+        invalidate_setups(user_id)
 
         await update.message.reply_text(
             f"✅ Setup created!\n\n"
-            f"Code: {context.user_data['setup_code']}\n"
-            f"Name: {context.user_data['setup_name']}\n"
+            f"Code: {setup_code}\n"
+            f"Name: {setup_name}\n"
             f"Description: {description or 'None'}\n\n"
             f"Use /setups to see all your setups."
         )
     except Exception as e:
         await update.message.reply_text(f"❌ Error creating setup: {e}")
 
-    return ConversationHandler.END
-
 
 
 def get_addsetup_handler():
@@ -148,32 +313,52 @@ def get_addsetup_handler():
 # ==================== EDIT SETUP ====================
 
 async def editsetup_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Start /editsetup conversation"""
+    """
+    Start /editsetup conversation.
+
+    Power users can skip the conversation with `/editsetup CODE name New Name`
+    or `/editsetup CODE description New text`.
+    """
     telegram_id = update.effective_user.id
     db = context.application.bot_data['db']
 
-    user = db.get_user_by_telegram_id(telegram_id)
-
-    if not user:
-        await update.message.reply_text("❌ Please use /start first")
-        return ConversationHandler.END
-
-    setups = db.get_user_setups(user['id'])
+    setups = await asyncio.to_thread(db.get_setups_by_telegram_id, telegram_id)
     if not setups:
+        # Only distinguish "unknown user" on the empty path
+        if not await _get_user_id(db, telegram_id, context):
+            await update.message.reply_text("❌ Please use /start first")
+            return ConversationHandler.END
+
         await update.message.reply_text(
             "No setups to edit. Use /addsetup to create one."
         )
         return ConversationHandler.END
 
-    # Create setup selection keyboard
-    keyboard = []
-    for setup in setups:
-        keyboard.append([InlineKeyboardButton(
-            f"{setup['setup_code']} - {setup['setup_name']}",
-            callback_data=f"edit_{setup['setup_code']}"
-        )])
+    args = update.message.text.split(maxsplit=3)[1:]
+    if len(args) == 3:
+        setup_code, field, new_value = args[0].upper(), args[1].lower(), args[2].strip()
+        setup_id = next((s['id'] for s in setups if s['setup_code'] == setup_code), None)
+
+        if setup_id is None:
+            await update.message.reply_text(f"❌ Setup '{setup_code}' not found.")
+        elif field not in SETUP_FIELD_UPDATE_SQL:
+            await update.message.reply_text("❌ Field must be 'name' or 'description'.")
+        else:
+            new_value, error = _clean_field_value(field, new_value)
+            if error:
+                await update.message.reply_text(error)
+            else:
+                user_id = await _get_user_id(db, telegram_id, context)
+                await _save_setup_field(update, context, user_id, setup_id, setup_code, field, new_value)
+        return ConversationHandler.END
+
+    # Remember id -> code for the follow-up messages
+    context.user_data['edit_setup_state'] = SelectSetupState(
+        codes={s['id']: s['setup_code'] for s in setups}
+    )
 
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    # Create setup selection keyboard
+    reply_markup = _build_setup_keyboard(tuple(tuple(s) for s in setups), "edit")
 
     await update.message.reply_text(
         "Select setup to edit:",
@@ -188,20 +373,15 @@ async def edit_select_field(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
-    setup_code = query.data.replace("edit_", "")
-    context.user_data['edit_setup_code'] = setup_code
-
-    keyboard = [
-        [InlineKeyboardButton("📝 Edit Name", callback_data="field_name")],
-        [InlineKeyboardButton("📄 Edit Description", callback_data="field_description")],
-        [InlineKeyboardButton("❌ Cancel", callback_data="cancel")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    state = _selected_setup(context, 'edit_setup_state', query.data)
+    if state is None:
+        return await _selection_expired(query)
+    setup_code = state.code
 
     await query.edit_message_text(
         f"Editing setup: {setup_code}\n\n"
         f"What do you want to edit?",
-        reply_markup=reply_markup
+        reply_markup=_EDIT_FIELD_KB
     )
 
     return EDIT_FIELD
@@ -217,7 +397,7 @@ async def edit_ask_value(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return ConversationHandler.END
 
     field = query.data.replace("field_", "")
-    context.user_data['edit_field'] = field
+    context.user_data['edit_setup_state'].edit_field = field
 
     if field == "name":
         await query.edit_message_text("Enter new setup name:")
@@ -229,48 +409,48 @@ async def edit_ask_value(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def edit_save_value(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Save edited value"""
-    new_value = update.message.text.strip()
+    state = context.user_data['edit_setup_state']
+    field = state.edit_field
 
-    if new_value.lower() == 'skip':
-        new_value = None
+    new_value, error = _clean_field_value(field, update.message.text.strip())
+    if error:
+        await update.message.reply_text(
+            f"{error}\n\n"
+            "Try again:"
+        )
+        return EDIT_VALUE
 
     telegram_id = update.effective_user.id
     db = context.application.bot_data['db']
 
-    user = db.get_user_by_telegram_id(telegram_id)
-    setup_code = context.user_data['edit_setup_code']
-    field = context.user_data['edit_field']
+    user_id = await _get_user_id(db, telegram_id, context)
 
-    # Update setup
-    cursor = db.conn.cursor()
+    await _save_setup_field(
+        update, context, user_id, state.setup_id, state.code, field, new_value
+    )
+    return ConversationHandler.END
 
-    if field == "name":
-        cursor.execute(
-            "UPDATE setups SET setup_name = ?, updated_at = CURRENT_TIMESTAMP WHERE user_id = ? AND setup_code = ?",
-            (new_value, user['id'], setup_code)
-        )
-    elif field == "description":
-        cursor.execute(
-            "UPDATE setups SET description = ?, updated_at = CURRENT_TIMESTAMP WHERE user_id = ? AND setup_code = ?",
-            (new_value, user['id'], setup_code)
-        )
 
-    db.conn.commit()
+async def _save_setup_field(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int,
+                            setup_id: int, setup_code: str, field: str, new_value):
+    """Write one edited field and confirm to the user"""
+    # Update setup (batched with other concurrent writes)
+    write_queue = context.application.bot_data['write_queue']
+    await write_queue.submit(SETUP_FIELD_UPDATE_SQL[field], (new_value, setup_id, user_id))
+    invalidate_setups(user_id)
     await update.message.reply_text(
         f"✅ Setup updated!\n\n"
         f"Code: {setup_code}\n"
         f"Updated {field}: {new_value or 'None'}"
     )
 
-    return ConversationHandler.END
-
 
 def get_editsetup_handler():
     """Get the /editsetup conversation handler"""
     return ConversationHandler(
         entry_points=[CommandHandler("editsetup", editsetup_start)],
         states={
-            EDIT_SELECT: [CallbackQueryHandler(edit_select_field)],
+            EDIT_SELECT: [CallbackQueryHandler(edit_select_field, pattern=r'^edit_\d+$')],
             EDIT_FIELD: [CallbackQueryHandler(edit_ask_value)],
             EDIT_VALUE: [MessageHandler(filters.TEXT & ~filters.COMMAND, edit_save_value)]
         },
@@ -289,30 +469,25 @@ async def deletesetup_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = update.effective_user.id
     db = context.application.bot_data['db']
 
-    user = db.get_user_by_telegram_id(telegram_id)
-
-    if not user:
-        await update.message.reply_text("❌ Please use /start first")
-        return ConversationHandler.END
-
-    setups = db.get_user_setups(user['id'])
+    setups = await asyncio.to_thread(db.get_setups_by_telegram_id, telegram_id)
     if not setups:
+        # Only distinguish "unknown user" on the empty path
+        if not await _get_user_id(db, telegram_id, context):
+            await update.message.reply_text("❌ Please use /start first")
+            return ConversationHandler.END
+
         await update.message.reply_text(
             "No setups to delete. Use /addsetup to create one."
         )
         return ConversationHandler.END
 
-    # Create setup selection keyboard
-    keyboard = []
-    for setup in setups:
-        keyboard.append([InlineKeyboardButton(
-            f"🗑️ {setup['setup_code']} - {setup['setup_name']}",
-            callback_data=f"delete_{setup['setup_code']}"
-        )])
-
-    keyboard.append([InlineKeyboardButton("❌ Cancel", callback_data="cancel")])
+    # Remember id -> code for the follow-up messages
+    context.user_data['delete_setup_state'] = SelectSetupState(
+        codes={s['id']: s['setup_code'] for s in setups}
+    )
 
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    # Create setup selection keyboard
+    reply_markup = _build_setup_keyboard(tuple(tuple(s) for s in setups), "delete")
 
     await update.message.reply_text(
         "⚠️ Select setup to DELETE:",
@@ -331,21 +506,15 @@ async def delete_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await query.edit_message_text("❌ Deletion cancelled")
         return ConversationHandler.END
 
-    setup_code = query.data.replace("delete_", "")
-    context.user_data['delete_setup_code'] = setup_code
-
-    keyboard = [
-        [
-            InlineKeyboardButton("✅ Yes, Delete", callback_data="confirm_delete"),
-            InlineKeyboardButton("❌ Cancel", callback_data="cancel")
-        ]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    state = _selected_setup(context, 'delete_setup_state', query.data)
+    if state is None:
+        return await _selection_expired(query)
+    setup_code = state.code
 
     await query.edit_message_text(
         f"⚠️ Are you sure you want to delete setup '{setup_code}'?\n\n"
         f"This action cannot be undone!",
-        reply_markup=reply_markup
+        reply_markup=_DELETE_CONFIRM_KB
     )
 
     return DELETE_CONFIRM
@@ -363,18 +532,18 @@ async def delete_execute(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = update.effective_user.id
     db = context.application.bot_data['db']
 
-    user = db.get_user_by_telegram_id(telegram_id)
-    setup_code = context.user_data['delete_setup_code']
+    user_id = await _get_user_id(db, telegram_id, context)
+    state = context.user_data.get('delete_setup_state')
+    if not isinstance(state, SelectSetupState) or not state.code:
+        return await _selection_expired(query)
 
-    # Delete setup (soft delete by setting is_active = 0)
-    cursor = db.conn.cursor()
-    cursor.execute(
-        "UPDATE setups SET is_active = 0, updated_at = CURRENT_TIMESTAMP WHERE user_id = ? AND setup_code = ?",
-        (user['id'], setup_code)
-    )
-    db.conn.commit()
+    # Soft delete (is_active = 0): past trades still reference the setup
+    # by (setup_code, user_id), so the row and its code are kept
+    write_queue = context.application.bot_data['write_queue']
+    await write_queue.submit(DEACTIVATE_SETUP_SQL, (state.setup_id, user_id))
+    invalidate_setups(user_id)
     await query.edit_message_text(
-        f"✅ Setup '{setup_code}' deleted successfully!"
+        f"✅ Setup '{state.code}' deleted successfully!"
     )
 
     return ConversationHandler.END
@@ -385,7 +554,7 @@ def get_deletesetup_handler():
     return ConversationHandler(
         entry_points=[CommandHandler("deletesetup", deletesetup_start)],
         states={
-            DELETE_SELECT: [CallbackQueryHandler(delete_confirm)],
+            DELETE_SELECT: [CallbackQueryHandler(delete_confirm, pattern=r'^(delete_\d+|cancel)$')],
             DELETE_CONFIRM: [CallbackQueryHandler(delete_execute)]
         },
         fallbacks=[
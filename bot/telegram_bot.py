@@ -5,12 +5,24 @@ Handles user interaction, validates input, and sends trade commands to Trade Eng
 Uses python-telegram-bot ConversationHandler for state management.
 """
 
+import asyncio
+import atexit
+import functools
 import logging
+import logging.handlers
+import operator
 import os
-from datetime import datetime
+import queue
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
     Application,
+    PicklePersistence,
+    PersistenceInput,
     CommandHandler,
     MessageHandler,
     CallbackQueryHandler,
@@ -20,7 +32,6 @@ from telegram.ext import (
 )
 from telegram.error import TimedOut, NetworkError, RetryAfter, BadRequest
 
-from bot.trade_command_builder import TradeCommandBuilder
 from bot.setup_commands import (
     get_addsetup_handler,
     get_editsetup_handler,
@@ -45,11 +56,23 @@ from bot.order_commands import (
 )
 from bot.modify_order_commands import get_modifyorder_handler
 from bot.position_commands import positions_command, handle_position_action
-from bot.conversation_utils import cancel_conversation, cancel_and_process_new_command
+from bot.conversation_utils import PRICE_RE, cancel_conversation, cancel_and_process_new_command
+from bot.write_queue import WriteQueue
+from bot.update_processor import PerChatUpdateProcessor
+from bot.rate_limiter import TokenBucketRateLimiter
+from bot.mt5_runner import run_mt5
+from bot.user_cache import (
+    cached_user,
+    cached_settings,
+    cached_setups,
+    get_user,
+    get_settings,
+    get_setups,
+    invalidate_user
+)
 from engine.symbol_resolver import SymbolResolver
 from engine.trade_validator import TradeValidator
 from engine.risk_calculator import RiskCalculator
-from engine.mt5_adapter import MT5Adapter
 from database.db_manager import DatabaseManager
 
 # Conversation states
@@ -64,11 +87,159 @@ from database.db_manager import DatabaseManager
     CONFIRM
 ) = range(8)
 
-# Setup logging
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
+# Trade engine hand-off: pending MT5 submissions per account
+ENGINE_QUEUE_MAXSIZE = 1000
+# Seconds between background MT5 health checks / reconnects
+MT5_HEARTBEAT_INTERVAL = 30
+
+# The only update types any handler consumes; Telegram skips the rest
+_ALLOWED_UPDATES = [Update.MESSAGE, Update.CALLBACK_QUERY]
+
+# Trade command keys stored as trades columns
+_TRADE_FIELDS = (
+    'user_id', 'account_id', 'symbol', 'order_type', 'entry', 'sl', 'tp',
+    'volume', 'risk_usd', 'rr', 'emotion', 'setup_code', 'chart_url'
+)
+
+# Valid stop loss side per order type: rule(sl, entry) -> bool
+_SL_RULE = {'LIMIT_BUY': operator.lt, 'LIMIT_SELL': operator.gt}
+
+# Fixed reply texts
+_SETTINGS_TEXT = (
+    "⚙️ Your Settings:\n\n"
+    "📊 Symbol:\n"
+    "  Base: {base}\n"
+    "  Prefix: {prefix}\n"
+    "  Suffix: {suffix}\n\n"
+    "💰 Risk:\n"
+    "  Type: {risk_type}\n"
+    "  Value: {risk_value}\n\n"
+    "📈 R:R Ratio: {rr_ratio}:1\n"
+    "  (TP auto-calculated from SL)\n\n"
+    "Use /setsymbol, /setrisktype, /setrr to change settings"
+)
+# Filled from a TradeDraft (d) by ask_confirm
+_CONFIRM_TEXT = (
+    "📋 Final Confirmation\n\n"
+    "{d.order_type}: {d.symbol}\n"
+    "ET: {d.entry}\n"
+    "SL: {d.sl}\n"
+    "TP: {d.tp}\n"
+    "Volume: {d.volume} lots\n"
+    "Risk: ${d.risk_usd} | R:R: {d.rr}\n"
+    "Emotion: {d.emotion} | Setup: {d.setup_code}\n"
+    "Chart: {chart}\n\n"
+    "Execute this trade?"
+)
+_SETUPS_FOOTER_TEXT = (
+    "/addsetup - Add new\n"
+    "/editsetup - Edit existing\n"
+    "/deletesetup - Delete\n"
+)
+_MT5_NOT_CONNECTED_TEXT = (
+    "❌ MT5 Not Connected\n\n"
+    "Please ensure MetaTrader 5 is running and logged in,\n"
+    "then restart the bot."
+)
+_MT5_RECONNECT_FAILED_TEXT = (
+    "❌ Failed to reconnect to MT5\n\n"
+    "Please check:\n"
+    "- MT5 is running\n"
+    "- You are logged in\n"
+    "- No firewall blocking"
+)
+_CHANGEACCOUNT_USAGE_TEXT = (
+    "ℹ️ Cách dùng:\n\n"
+    "/changeaccount <login> <password> <server>\n\n"
+    "Ví dụ:\n"
+    "/changeaccount 12345678 mypassword Broker-Server\n\n"
+    "⚠️ Lưu ý: Lệnh sẽ bị xóa sau 5 giây để bảo mật password!"
 )
+_TRADE_FAILED_HELP_TEXT = (
+    "Please check:\n"
+    "- Market is open\n"
+    "- Symbol exists in MT5\n"
+    "- Sufficient margin"
+)
+_EXECUTION_ERROR_HELP_TEXT = (
+    "Please ensure:\n"
+    "- MetaTrader 5 is running\n"
+    "- You are logged in\n"
+    "- Market is open\n\n"
+    "Use /settings to check configuration"
+)
+
+# Static keyboards, built once and shared by every conversation
+_EMOTION_KB = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("😌 Calm", callback_data="calm"),
+        InlineKeyboardButton("💪 Confident", callback_data="confident")
+    ],
+    [
+        InlineKeyboardButton("😰 FOMO", callback_data="fomo"),
+        InlineKeyboardButton("😤 Stressed", callback_data="stressed")
+    ],
+    [InlineKeyboardButton("😡 Revenge", callback_data="revenge")]
+])
+_CONFIRM_KB = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("✅ Confirm", callback_data="confirm"),
+        InlineKeyboardButton("❌ Cancel", callback_data="cancel")
+    ]
+])
+
+
+@lru_cache(maxsize=512)
+def _build_setup_grid(setup_codes: tuple) -> InlineKeyboardMarkup:
+    """
+    Build (and memoize) the 3-wide setup picker for a tuple of setup codes.
+
+    Keyed by the codes themselves, so any setup change yields a new key.
+    """
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton(code, callback_data=code) for code in setup_codes[i:i + 3]]
+        for i in range(0, len(setup_codes), 3)
+    ])
+
+
+# Preview numbers computed together by TradingBot._compute_trade_metrics
+TradeMetrics = namedtuple('TradeMetrics', ['rr', 'volume', 'risk_points'])
+
+
+@dataclass(slots=True)
+class TradeDraft:
+    """In-progress /limitbuy or /limitsell answers"""
+    order_type: str = ""
+    user_id: int = 0
+    telegram_id: int = 0
+    symbol_base: str = ""
+    symbol: str = ""
+    entry: float = 0.0
+    sl: float = 0.0
+    tp: float = 0.0
+    volume: float = 0.0
+    risk_usd: float = 0.0
+    rr: float = 0.0
+    emotion: str = ""
+    setup_code: str = ""
+    chart_url: str | None = None
+    settings: dict = field(default_factory=dict)  # user_settings snapshot taken at /limitbuy or /limitsell
+
+
+# Setup logging: handlers only enqueue records; a listener thread does the
+# formatting and stream I/O so logging never blocks the event loop
+_root_logger = logging.getLogger()
+if not _root_logger.handlers:  # Same "configure once" rule as basicConfig
+    _log_queue = queue.SimpleQueue()
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(
+        logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    )
+    _log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)  # Flush queued records on exit
+    _root_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    _root_logger.setLevel(logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -87,15 +258,36 @@ class TradingBot:
         self.db = DatabaseManager(db_path)
         self.db.connect()
         self.db.initialize_schema()
+        self.write_queue = WriteQueue(self.db)
+        # One bounded pool for all blocking I/O (SQLite now, engine calls later).
+        # Sized like the stdlib default but capped, so bursts of button presses
+        # queue up instead of spawning threads; each worker keeps its own
+        # SQLite connection via DatabaseManager's thread-local connections.
+        self._io_pool = ThreadPoolExecutor(
+            max_workers=min(32, (os.cpu_count() or 4) * 4),
+            thread_name_prefix="bot-io"
+        )
 
         self.symbol_resolver = SymbolResolver()
         self.trade_validator = TradeValidator()
         self.risk_calculator = RiskCalculator()
+        # Preview metrics are pure; repeat traders resubmit the same inputs
+        self._trade_metrics = functools.lru_cache(maxsize=4096)(self._compute_trade_metrics)
+        # Imported on construction, not with this module: keeps the MT5 SDK
+        # out of imports that never trade
+        from engine.mt5_adapter import MT5Adapter
         self.mt5_adapter = MT5Adapter()
+        # Confirmed trades wait in one queue per account_id, each drained in
+        # order by its own worker task (created on the account's first trade)
+        self._engine_queues = {}
+        self._engine_tasks = []
+        self._report_tasks = set()  # Outcome record/edit tasks still running
+
+        self._heartbeat_task = None
 
         # Don't connect to MT5 on initialization to avoid IPC timeout
-        # Connection will be established on first trade execution
-        logger.info("Bot initialized. MT5 connection will be established when needed.")
+        # Connection is established by the background heartbeat once the bot runs
+        logger.info("Bot initialized. MT5 connection will be established in the background.")
 
     async def setup_bot_menu(self, app):
         """
@@ -150,6 +342,90 @@ class TradingBot:
 
         logger.info("✅ Menu button and commands configured")
 
+    def _compute_trade_metrics(self, order_type: str, entry: float, sl: float, tp: float,
+                               risk_usd: float, pip_value: float, tick_size: float,
+                               volume_step: float) -> TradeMetrics:
+        """
+        R:R, volume and risk distance for the preview in one call.
+
+        The SL side was already checked in ask_take_profit, so this skips the
+        validate_trade wrapper and goes straight to the two calculations.
+        """
+        return TradeMetrics(
+            rr=self.trade_validator.calculate_rr_ratio(order_type, entry, sl, tp),
+            volume=self.risk_calculator.calculate_volume(
+                risk_usd, entry, sl, pip_value, tick_size, volume_step
+            ),
+            risk_points=abs(entry - sl)
+        )
+
+    async def _adb(self, fn, *args, **kwargs):
+        """Run a blocking DatabaseManager call on the shared I/O pool"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._io_pool, functools.partial(fn, *args, **kwargs)
+        )
+
+    async def _cached_user(self, telegram_id: int):
+        """Get user row, served from the TTL cache when possible"""
+        user = cached_user(telegram_id)
+        if user is None:
+            user = await self._adb(get_user, self.db, telegram_id)
+        return user
+
+    async def _cached_settings(self, user_id: int):
+        """Get user settings row, served from the TTL cache when possible"""
+        settings = cached_settings(user_id)
+        if settings is None:
+            settings = await self._adb(get_settings, self.db, user_id)
+        return settings
+
+    async def _cached_setups(self, user_id: int):
+        """Get active setups, served from the cache until a setup command changes them"""
+        setups = cached_setups(user_id)
+        if setups is None:
+            setups = await self._adb(get_setups, self.db, user_id)
+        return setups
+
+    async def post_init(self, app):
+        """Configure the menu and start the MT5 heartbeat"""
+        # asyncio.to_thread (run_mt5 and friends) uses the same bounded pool
+        asyncio.get_running_loop().set_default_executor(self._io_pool)
+        await self.setup_bot_menu(app)
+        self._heartbeat_task = asyncio.create_task(self._mt5_heartbeat())
+
+    async def _mt5_heartbeat(self):
+        """Check the MT5 session every MT5_HEARTBEAT_INTERVAL seconds and reconnect off the trade path"""
+        while True:
+            try:
+                healthy = await run_mt5(self.mt5_adapter.ensure_connected)
+                if not healthy:
+                    logger.warning("MT5 heartbeat: not connected, retrying in %ss", MT5_HEARTBEAT_INTERVAL)
+            except Exception:
+                # Keep the loop alive: a dead heartbeat would leave MT5 disconnected for good
+                logger.exception("MT5 heartbeat check failed, retrying in %ss", MT5_HEARTBEAT_INTERVAL)
+            await asyncio.sleep(MT5_HEARTBEAT_INTERVAL)
+
+    async def stop(self, app):
+        """
+        Stop the heartbeat and finish queued trades.
+
+        Runs as post_stop, while the bot's HTTP client is still up, so every
+        drained trade can still edit its message with the MT5 result.
+        """
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+        for engine_queue in self._engine_queues.values():
+            await engine_queue.join()
+        await asyncio.gather(*self._report_tasks, return_exceptions=True)
+        for task in self._engine_tasks:
+            task.cancel()
+
+    async def shutdown(self, app):
+        """Flush batched writes, stop I/O threads and close SQLite"""
+        await self.write_queue.close()
+        self._io_pool.shutdown(wait=True)
+        self.db.close_all()
+
     async def error_handler(self, update: object, context: ContextTypes.DEFAULT_TYPE):
         """
         Handle errors that occur during update processing.
@@ -159,7 +435,7 @@ class TradingBot:
         error = context.error
 
         # Log the error
-        logger.error(f"Exception while handling update: {error}", exc_info=context.error)
+        logger.error("Exception while handling update: %s", error, exc_info=context.error)
 
         # Handle specific error types
         if isinstance(error, TimedOut):
@@ -169,21 +445,21 @@ class TradingBot:
 
         if isinstance(error, RetryAfter):
             retry_after = error.retry_after
-            logger.warning(f"⚠️ RATE LIMITED by Telegram. Must wait {retry_after}s before next request")
-            logger.warning(f"   Update that caused rate limit: {update}")
+            logger.warning("⚠️ RATE LIMITED by Telegram. Must wait %ss before next request", retry_after)
+            logger.warning("   Update that caused rate limit: %s", update)
             # Don't send message - will make rate limiting worse
             # User should wait before sending more commands
             return
 
         if isinstance(error, BadRequest):
-            logger.warning(f"⚠️ Bad request error: {error}")
-            logger.debug(f"   Update: {update}")
+            logger.warning("⚠️ Bad request error: %s", error)
+            logger.debug("   Update: %s", update)
             # These errors are usually handled gracefully in menu_handler
             return
 
         if isinstance(error, NetworkError):
-            logger.warning(f"⚠️ Network error: {error}")
-            logger.debug(f"   Update: {update}")
+            logger.warning("⚠️ Network error: %s", error)
+            logger.debug("   Update: %s", update)
             # Transient network issues, will be retried automatically
             return
 
@@ -194,10 +470,16 @@ class TradingBot:
                     "⚠️ An error occurred while processing your request. Please try again."
                 )
         except Exception as e:
-            logger.error(f"Failed to send error message to user: {e}")
+            logger.error("Failed to send error message to user: %s", e)
 
-    def run(self):
-        """Start the bot"""
+    def run(self, max_pending_per_chat: int = 8):
+        """
+        Start the bot.
+
+        Args:
+            max_pending_per_chat: Updates one chat may have in flight before
+                further ones are dropped (see PerChatUpdateProcessor)
+        """
         from telegram.request import HTTPXRequest
 
         # Configure request with longer timeouts and automatic retry
@@ -209,41 +491,44 @@ class TradingBot:
             http_version="1.1"     # HTTP/1.1 for better compatibility
         )
 
-        app = Application.builder()\
+        builder = Application.builder()\
             .token(self.token)\
-            .post_init(self.setup_bot_menu)\
+            .post_init(self.post_init)\
+            .post_stop(self.stop)\
+            .post_shutdown(self.shutdown)\
             .request(request)\
-            .build()
+            .concurrent_updates(PerChatUpdateProcessor(max_pending_per_chat=max_pending_per_chat))\
+            .rate_limiter(TokenBucketRateLimiter())
+
+        # Optional: keep user_data and trade conversations across restarts.
+        # bot_data holds live objects (DB, MT5 adapter) and is never persisted.
+        persistence_file = os.getenv("PERSISTENCE_FILE")
+        if persistence_file:
+            builder = builder.persistence(PicklePersistence(
+                filepath=persistence_file,
+                store_data=PersistenceInput(bot_data=False, callback_data=False)
+            ))
+        persistent = bool(persistence_file)
+
+        app = builder.build()
 
         # Store MT5 adapter in bot_data for shared access
         app.bot_data['mt5_adapter'] = self.mt5_adapter
         app.bot_data['db'] = self.db
+        app.bot_data['write_queue'] = self.write_queue
 
         # Register error handler
         app.add_error_handler(self.error_handler)
 
-        # Conversation handler for /limitbuy
-        limitbuy_handler = ConversationHandler(
-            entry_points=[CommandHandler("limitbuy", self.limitbuy_start)],
-            states={
-                SYMBOL: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.ask_entry)],
-                ENTRY: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.ask_stop_loss)],
-                STOP_LOSS: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.ask_take_profit)],
-                EMOTION: [CallbackQueryHandler(self.ask_setup)],
-                SETUP: [CallbackQueryHandler(self.ask_chart_url)],
-                CHART_URL: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.ask_confirm)],
-                CONFIRM: [CallbackQueryHandler(self.execute_trade)]
-            },
-            fallbacks=[
-                CommandHandler("cancel", cancel_conversation),
-                MessageHandler(filters.COMMAND, cancel_and_process_new_command)  # Handle any other command
+        # One conversation handler for /limitbuy and /limitsell: the states are
+        # identical and the entry point records the order type in the draft
+        limit_order_handler = ConversationHandler(
+            entry_points=[
+                CommandHandler("limitbuy", self.limitbuy_start),
+                CommandHandler("limitsell", self.limitsell_start)
             ],
-            per_message=False  # Track per user+chat, not per message
-        )
-
-        # Conversation handler for /limitsell
-        limitsell_handler = ConversationHandler(
-            entry_points=[CommandHandler("limitsell", self.limitsell_start)],
+            name="limit_order",
+            persistent=persistent,
             states={
                 SYMBOL: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.ask_entry)],
                 ENTRY: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.ask_stop_loss)],
@@ -295,27 +580,40 @@ class TradingBot:
         app.add_handler(CallbackQueryHandler(handle_menu_callback, pattern="^(menu_|action_)"))
 
         # Trade handlers
-        app.add_handler(limitbuy_handler)
-        app.add_handler(limitsell_handler)
-
-        logger.info("Bot started")
-        app.run_polling()
+        app.add_handler(limit_order_handler)
+
+        webhook_url = os.getenv("WEBHOOK_URL")
+        if webhook_url:
+            # Telegram pushes updates to us; requires a public HTTPS endpoint
+            logger.info("Bot started (webhook)")
+            app.run_webhook(
+                listen=os.getenv("WEBHOOK_LISTEN", "0.0.0.0"),
+                port=int(os.getenv("PORT", "8443")),
+                url_path=self.token,
+                webhook_url=f"{webhook_url.rstrip('/')}/{self.token}",
+                allowed_updates=_ALLOWED_UPDATES
+            )
+        else:
+            # Long polling: each getUpdates waits up to 20s for new updates
+            logger.info("Bot started (polling)")
+            app.run_polling(timeout=20, allowed_updates=_ALLOWED_UPDATES)
 
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command - Show main menu"""
         telegram_id = update.effective_user.id
+        invalidate_user(telegram_id)
 
         # Get or create user
-        user = self.db.get_user_by_telegram_id(telegram_id)
+        user = await self._cached_user(telegram_id)
         is_new_user = False
         if not user:
-            user_id = self.db.create_user(
+            await self._adb(
+                self.db.register_user,
                 telegram_id=telegram_id,
                 username=update.effective_user.username,
                 first_name=update.effective_user.first_name,
                 last_name=update.effective_user.last_name
             )
-            self.db.create_default_settings(user_id)
             is_new_user = True
 
         # Show main menu (with welcome message for new users)
@@ -324,13 +622,13 @@ class TradingBot:
     async def settings(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /settings command"""
         telegram_id = update.effective_user.id
-        user = self.db.get_user_by_telegram_id(telegram_id)
+        user = await self._cached_user(telegram_id)
 
         if not user:
             await update.message.reply_text("Please use /start first")
             return
 
-        settings = self.db.get_user_settings(user['id'])
+        settings = await self._cached_settings(user['id'])
 
         if settings:
             # Handle sqlite3.Row object
@@ -346,43 +644,37 @@ class TradingBot:
             else:
                 risk_value_display = f"{risk_value:.1f}$"
 
-            await update.message.reply_text(
-                f"⚙️ Your Settings:\n\n"
-                f"📊 Symbol:\n"
-                f"  Base: {settings['default_symbol_base']}\n"
-                f"  Prefix: {settings['symbol_prefix'] or 'None'}\n"
-                f"  Suffix: {settings['symbol_suffix'] or 'None'}\n\n"
-                f"💰 Risk:\n"
-                f"  Type: {settings['risk_type']}\n"
-                f"  Value: {risk_value_display}\n\n"
-                f"📈 R:R Ratio: {rr_ratio}:1\n"
-                f"  (TP auto-calculated from SL)\n\n"
-                f"Use /setsymbol, /setrisktype, /setrr to change settings"
-            )
+            await update.message.reply_text(_SETTINGS_TEXT.format(
+                base=settings['default_symbol_base'],
+                prefix=settings['symbol_prefix'] or 'None',
+                suffix=settings['symbol_suffix'] or 'None',
+                risk_type=settings['risk_type'],
+                risk_value=risk_value_display,
+                rr_ratio=rr_ratio
+            ))
 
     async def manage_setups(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /setups command"""
         telegram_id = update.effective_user.id
-        user = self.db.get_user_by_telegram_id(telegram_id)
+        user = await self._cached_user(telegram_id)
 
         if not user:
             await update.message.reply_text("Please use /start first")
             return
 
-        setups = self.db.get_user_setups(user['id'])
+        setups = await self._cached_setups(user['id'])
 
         if setups:
-            setup_list = "\n".join([f"- {s['setup_code']}: {s['setup_name']}" for s in setups])
-            await update.message.reply_text(f"Your Setups:\n\n{setup_list}\n\n""/addsetup - Add new\n"
-            "/editsetup - Edit existing\n"
-            "/deletesetup - Delete\n")
+            # Rows are (setup_code, setup_name): unpack instead of two lookups by name
+            setup_list = "\n".join(f"- {code}: {name}" for code, name in setups)
+            await update.message.reply_text(f"Your Setups:\n\n{setup_list}\n\n{_SETUPS_FOOTER_TEXT}")
         else:
             await update.message.reply_text("No setups configured. Use /addsetup to create one.")
 
     async def check_mt5_connection(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /mt5connection command - Check MT5 connection status"""
         telegram_id = update.effective_user.id
-        user = self.db.get_user_by_telegram_id(telegram_id)
+        user = await self._cached_user(telegram_id)
 
         if not user:
             await update.message.reply_text("Please use /start first")
@@ -390,7 +682,7 @@ class TradingBot:
 
         # Check MT5 connection
         if self.mt5_adapter.connected:
-            account_info = self.mt5_adapter.get_account_info()
+            account_info = await run_mt5(self.mt5_adapter.get_account_info)
             await update.message.reply_text(
                 f"✅ MT5 Connected\n\n"
                 f"Account: {account_info['login']}\n"
@@ -399,16 +691,12 @@ class TradingBot:
                 f"Currency: {account_info['currency']}"
             )
         else:
-            await update.message.reply_text(
-                "❌ MT5 Not Connected\n\n"
-                "Please ensure MetaTrader 5 is running and logged in,\n"
-                "then restart the bot."
-            )
+            await update.message.reply_text(_MT5_NOT_CONNECTED_TEXT)
 
     async def reconnect_mt5(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /reconnectmt5 command - Reconnect to MT5 and reload credentials from .env"""
         telegram_id = update.effective_user.id
-        user = self.db.get_user_by_telegram_id(telegram_id)
+        user = await self._cached_user(telegram_id)
 
         if not user:
             await update.message.reply_text("Please use /start first")
@@ -423,15 +711,15 @@ class TradingBot:
             load_dotenv(override=True)  # Force reload
             logger.info("Reloaded .env file")
         except Exception as e:
-            logger.warning(f"Could not reload .env: {e}")
+            logger.warning("Could not reload .env: %s", e)
 
         # Disconnect first
         if self.mt5_adapter.connected:
-            self.mt5_adapter.disconnect()
+            await run_mt5(self.mt5_adapter.disconnect)
 
         # Reconnect with new credentials from env
-        if self.mt5_adapter.connect():
-            account_info = self.mt5_adapter.get_account_info()
+        if await run_mt5(self.mt5_adapter.connect):
+            account_info = await run_mt5(self.mt5_adapter.get_account_info)
             await update.message.reply_text(
                 f"✅ MT5 Reconnected!\n\n"
                 f"Account: {account_info['login']}\n"
@@ -439,18 +727,12 @@ class TradingBot:
                 f"Currency: {account_info['currency']}"
             )
         else:
-            await update.message.reply_text(
-                "❌ Failed to reconnect to MT5\n\n"
-                "Please check:\n"
-                "- MT5 is running\n"
-                "- You are logged in\n"
-                "- No firewall blocking"
-            )
+            await update.message.reply_text(_MT5_RECONNECT_FAILED_TEXT)
 
     async def change_account(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /changeaccount command - Change MT5 account with custom credentials"""
         telegram_id = update.effective_user.id
-        user = self.db.get_user_by_telegram_id(telegram_id)
+        user = await self._cached_user(telegram_id)
 
         if not user:
             await update.message.reply_text("Please use /start first")
@@ -460,13 +742,7 @@ class TradingBot:
         args = context.args
 
         if len(args) < 3:
-            await update.message.reply_text(
-                "ℹ️ Cách dùng:\n\n"
-                "/changeaccount <login> <password> <server>\n\n"
-                "Ví dụ:\n"
-                "/changeaccount 12345678 mypassword Broker-Server\n\n"
-                "⚠️ Lưu ý: Lệnh sẽ bị xóa sau 5 giây để bảo mật password!"
-            )
+            await update.message.reply_text(_CHANGEACCOUNT_USAGE_TEXT)
             return
 
         login = args[0]
@@ -482,13 +758,9 @@ class TradingBot:
         # Send temporary processing message
         msg = await update.effective_chat.send_message("🔄 Đang đổi account MT5...")
 
-        # Disconnect current connection
-        if self.mt5_adapter.connected:
-            self.mt5_adapter.disconnect()
-
-        # Connect with new credentials
-        if self.mt5_adapter.connect(login=int(login), password=password, server=server):
-            account_info = self.mt5_adapter.get_account_info()
+        # Connect with new credentials (switches in place on a live terminal)
+        if await run_mt5(self.mt5_adapter.connect, login=int(login), password=password, server=server):
+            account_info = await run_mt5(self.mt5_adapter.get_account_info)
             await msg.edit_text(
                 f"✅ Đã đổi account MT5!\n\n"
                 f"Account: {account_info['login']}\n"
@@ -508,59 +780,46 @@ class TradingBot:
                 f"- Kết nối internet"
             )
 
-    # LIMIT BUY conversation flow
+    # LIMIT BUY / LIMIT SELL conversation flow
     async def limitbuy_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Start LIMIT BUY conversation"""
-        telegram_id = update.effective_user.id
-        user = self.db.get_user_by_telegram_id(telegram_id)
-
-        if not user:
-            await update.message.reply_text("Please use /start first")
-            return ConversationHandler.END
-
-        settings = self.db.get_user_settings(user['id'])
-
-        context.user_data['order_type'] = 'LIMIT_BUY'
-        context.user_data['user_id'] = user['id']
-        context.user_data['telegram_id'] = telegram_id
-
-        await update.message.reply_text(
-            f"LIMIT BUY Trade\n\n"
-            f"Enter symbol base (default: {settings['default_symbol_base']}):"
-        )
-
-        return SYMBOL
+        return await self._limit_start(update, context, 'LIMIT_BUY', "LIMIT BUY Trade\n\n")
 
     async def limitsell_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Start LIMIT SELL conversation"""
+        return await self._limit_start(update, context, 'LIMIT_SELL', "LIMIT SELL Trade\n\n")
+
+    async def _limit_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE,
+                           order_type: str, title: str):
+        """Shared entry point: load user and settings, start the draft, ask for symbol"""
         telegram_id = update.effective_user.id
-        user = self.db.get_user_by_telegram_id(telegram_id)
+        user = await self._cached_user(telegram_id)
 
         if not user:
             await update.message.reply_text("Please use /start first")
             return ConversationHandler.END
 
-        settings = self.db.get_user_settings(user['id'])
+        settings = await self._cached_settings(user['id'])
 
-        context.user_data['order_type'] = 'LIMIT_SELL'
-        context.user_data['user_id'] = user['id']
-        context.user_data['telegram_id'] = telegram_id
+        context.user_data['draft'] = TradeDraft(
+            order_type=order_type, user_id=user['id'], telegram_id=telegram_id,
+            settings=dict(settings)
+        )
 
         await update.message.reply_text(
-            f"LIMIT SELL Trade\n\n"
-            f"Enter symbol base (default: {settings['default_symbol_base']}):"
+            f"{title}Enter symbol base (default: {settings['default_symbol_base']}):"
         )
 
         return SYMBOL
 
     async def ask_entry(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Ask for entry price"""
+        d = context.user_data['draft']
         symbol_base = update.message.text.strip().upper() or "XAU"
-        context.user_data['symbol_base'] = symbol_base
+        d.symbol_base = symbol_base
 
         # Resolve symbol
-        user_id = context.user_data['user_id']
-        settings = self.db.get_user_settings(user_id)
+        settings = d.settings
 
         symbol = self.symbol_resolver.resolve(
             base=symbol_base,
@@ -568,7 +827,7 @@ class TradingBot:
             suffix=settings['symbol_suffix']
         )
 
-        context.user_data['symbol'] = symbol
+        d.symbol = symbol
 
         await update.message.reply_text(f"Symbol: {symbol}\n\nEnter entry price:")
 
@@ -576,151 +835,118 @@ class TradingBot:
 
     async def ask_stop_loss(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Ask for stop loss"""
-        try:
-            entry = float(update.message.text)
-            context.user_data['entry'] = entry
+        d = context.user_data['draft']
+        text = update.message.text.strip()
+        if not PRICE_RE.match(text):
+            await update.message.reply_text("Invalid price. Please enter a number:")
+            return ENTRY
+
+        entry = float(text)
+        d.entry = entry
+
+        order_type = d.order_type
 
-            order_type = context.user_data['order_type']
+        if order_type == 'LIMIT_BUY':
+            await update.message.reply_text(
+                f"Entry: {entry}\n\n"
+                f"Enter stop loss (must be < {entry}):"
+            )
+        else:
+            await update.message.reply_text(
+                f"Entry: {entry}\n\n"
+                f"Enter stop loss (must be > {entry}):"
+            )
+
+        return STOP_LOSS
+
+    async def ask_take_profit(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Calculate TP automatically from SL and R:R ratio"""
+        d = context.user_data['draft']
+        text = update.message.text.strip()
+        if not PRICE_RE.match(text):
+            await update.message.reply_text("Invalid price. Please enter a number:")
+            return STOP_LOSS
+
+        sl = float(text)
+        entry = d.entry
+        order_type = d.order_type
 
+        # Validate SL position (same rule as TradeValidator.validate_sl_position)
+        if not _SL_RULE[order_type](sl, entry):
             if order_type == 'LIMIT_BUY':
                 await update.message.reply_text(
-                    f"Entry: {entry}\n\n"
-                    f"Enter stop loss (must be < {entry}):"
+                    f"❌ Invalid! For BUY, SL must be < {entry}\n\n"
+                    f"Enter stop loss again:"
                 )
             else:
                 await update.message.reply_text(
-                    f"Entry: {entry}\n\n"
-                    f"Enter stop loss (must be > {entry}):"
+                    f"❌ Invalid! For SELL, SL must be > {entry}\n\n"
+                    f"Enter stop loss again:"
                 )
-
             return STOP_LOSS
 
-        except ValueError:
-            await update.message.reply_text("Invalid price. Please enter a number:")
-            return ENTRY
-
-    async def ask_take_profit(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Calculate TP automatically from SL and R:R ratio"""
-        try:
-            sl = float(update.message.text)
-            entry = context.user_data['entry']
-            order_type = context.user_data['order_type']
-
-            # Validate SL position
-            is_valid = self.trade_validator.validate_sl_position(
-                order_type=order_type,
-                entry_price=entry,
-                sl_price=sl
-            )
-
-            if not is_valid:
-                if order_type == 'LIMIT_BUY':
-                    await update.message.reply_text(
-                        f"❌ Invalid! For BUY, SL must be < {entry}\n\n"
-                        f"Enter stop loss again:"
-                    )
-                else:
-                    await update.message.reply_text(
-                        f"❌ Invalid! For SELL, SL must be > {entry}\n\n"
-                        f"Enter stop loss again:"
-                    )
-                return STOP_LOSS
-
-            context.user_data['sl'] = sl
-
-            # Get user's R:R ratio setting
-            user_id = context.user_data['user_id']
-            settings = self.db.get_user_settings(user_id)
+        d.sl = sl
 
-            # Handle sqlite3.Row object
-            try:
-                rr_ratio = settings['default_rr_ratio'] if settings['default_rr_ratio'] is not None else 2.0
-            except (KeyError, TypeError):
-                rr_ratio = 2.0
+        # Get user's R:R ratio setting
+        settings = d.settings
 
-            # Calculate TP automatically
-            risk_distance = abs(entry - sl)
-            reward_distance = risk_distance * rr_ratio
+        # Settings snapshot may predate the default_rr_ratio column
+        try:
+            rr_ratio = settings['default_rr_ratio'] if settings['default_rr_ratio'] is not None else 2.0
+        except (KeyError, TypeError):
+            rr_ratio = 2.0
 
-            if order_type == 'LIMIT_BUY':
-                tp = entry + reward_distance
-            else:  # LIMIT_SELL
-                tp = entry - reward_distance
+        # Calculate TP automatically
+        risk_distance = abs(entry - sl)
+        reward_distance = risk_distance * rr_ratio
 
-            # Round to appropriate precision
-            tp = round(tp, 2)
-            context.user_data['tp'] = tp
+        if order_type == 'LIMIT_BUY':
+            tp = entry + reward_distance
+        else:  # LIMIT_SELL
+            tp = entry - reward_distance
 
-            await update.message.reply_text(
-                f"✅ Stop Loss: {sl}\n\n"
-                f"📊 Auto-calculated TP:\n"
-                f"Risk: {risk_distance:.1f} points\n"
-                f"R:R: {rr_ratio}:1\n"
-                f"Reward: {reward_distance:.1f} points\n"
-                f"TP: {tp}\n\n"
-                f"💡 Use /setrr to change R:R ratio\n\n"
-                f"Proceeding to trade preview..."
-            )
+        # Round to appropriate precision
+        tp = round(tp, 2)
+        d.tp = tp
 
-            # Skip TP input, go directly to preview
-            return await self.show_preview(update, context)
+        await update.message.reply_text(
+            f"✅ Stop Loss: {sl}\n\n"
+            f"📊 Auto-calculated TP:\n"
+            f"Risk: {risk_distance:.1f} points\n"
+            f"R:R: {rr_ratio}:1\n"
+            f"Reward: {reward_distance:.1f} points\n"
+            f"TP: {tp}\n\n"
+            f"💡 Use /setrr to change R:R ratio\n\n"
+            f"Proceeding to trade preview..."
+        )
 
-        except ValueError:
-            await update.message.reply_text("Invalid price. Please enter a number:")
-            return STOP_LOSS
+        # Skip TP input, go directly to preview
+        return await self.show_preview(update, context)
 
     async def show_preview(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show trade preview and ask for emotion"""
+        d = context.user_data['draft']
         try:
             # Get trade details
-            entry = context.user_data['entry']
-            sl = context.user_data['sl']
-            tp = context.user_data['tp']
-            order_type = context.user_data['order_type']
-            symbol = context.user_data['symbol']
-
-            # Calculate R:R
-            validation = self.trade_validator.validate_trade(
-                order_type=order_type,
-                entry_price=entry,
-                sl_price=sl,
-                tp_price=tp
-            )
+            entry = d.entry
+            sl = d.sl
+            tp = d.tp
+            order_type = d.order_type
+            symbol = d.symbol
 
-            # Calculate volume (mock pip value for now - will get from MT5)
-            user_id = context.user_data['user_id']
-            settings = self.db.get_user_settings(user_id)
+            # Calculate R:R and volume (mock pip value for now - will get from MT5)
+            settings = d.settings
 
             # Mock: assume $1 per lot per point for gold
             pip_value = 1.0
             risk_usd = settings['risk_value']
 
-            volume = self.risk_calculator.calculate_volume(
-                risk_usd=risk_usd,
-                entry_price=entry,
-                sl_price=sl,
-                pip_value=pip_value,
-                tick_size=0.01,
-                volume_step=0.01
-            )
+            metrics = self._trade_metrics(order_type, entry, sl, tp, risk_usd, pip_value, 0.01, 0.01)
+            volume = metrics.volume
 
-            context.user_data['volume'] = volume
-            context.user_data['risk_usd'] = risk_usd
-            context.user_data['rr'] = validation['rr_ratio']
-
-            # Create emotion keyboard
-            keyboard = [
-                [
-                    InlineKeyboardButton("😌 Calm", callback_data="calm"),
-                    InlineKeyboardButton("💪 Confident", callback_data="confident")
-                ],
-                [
-                    InlineKeyboardButton("😰 FOMO", callback_data="fomo"),
-                    InlineKeyboardButton("😤 Stressed", callback_data="stressed")
-                ],
-                [InlineKeyboardButton("😡 Revenge", callback_data="revenge")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            d.volume = volume
+            d.risk_usd = risk_usd
+            d.rr = metrics.rr
 
             await update.message.reply_text(
                 f"📊 Trade Preview\n\n"
@@ -731,15 +957,15 @@ class TradingBot:
                 f"TP: {tp}\n\n"
                 f"💰 Risk: ${risk_usd}\n"
                 f"📦 Volume: {volume} lots\n"
-                f"📈 R:R: {validation['rr_ratio']}\n\n"
+                f"📈 R:R: {metrics.rr}\n\n"
                 f"How are you feeling?",
-                reply_markup=reply_markup
+                reply_markup=_EMOTION_KB
             )
 
             return EMOTION
 
         except Exception as e:
-            logger.error(f"Error in show_preview: {e}")
+            logger.error("Error in show_preview: %s", e)
             await update.message.reply_text(
                 "❌ Error showing preview. Please try again or /cancel"
             )
@@ -747,37 +973,27 @@ class TradingBot:
 
     async def ask_setup(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Ask for setup selection"""
+        d = context.user_data['draft']
         query = update.callback_query
         await query.answer()
 
         emotion = query.data
-        context.user_data['emotion'] = emotion
+        d.emotion = emotion
 
         # Get user setups
-        user_id = context.user_data['user_id']
-        setups = self.db.get_user_setups(user_id)
+        user_id = d.user_id
+        setups = await self._cached_setups(user_id)
 
         if not setups:
             await query.edit_message_text(
                 "No setups configured! Use /addsetup first.\n\n"
                 "Using default setup: GENERIC"
             )
-            context.user_data['setup_code'] = 'GENERIC'
+            d.setup_code = 'GENERIC'
             return CHART_URL
 
         # Create setup keyboard
-        keyboard = []
-        row = []
-        for i, setup in enumerate(setups):
-            row.append(InlineKeyboardButton(setup['setup_code'], callback_data=setup['setup_code']))
-            if (i + 1) % 3 == 0:
-                keyboard.append(row)
-                row = []
-
-        if row:
-            keyboard.append(row)
-
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = _build_setup_grid(tuple(s['setup_code'] for s in setups))
 
         await query.edit_message_text(
             f"Emotion: {emotion}\n\nSelect your setup:",
@@ -788,11 +1004,12 @@ class TradingBot:
 
     async def ask_chart_url(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Ask for TradingView chart URL"""
+        d = context.user_data['draft']
         query = update.callback_query
         await query.answer()
 
         setup_code = query.data
-        context.user_data['setup_code'] = setup_code
+        d.setup_code = setup_code
 
         await query.edit_message_text(
             f"Setup: {setup_code}\n\n"
@@ -803,40 +1020,24 @@ class TradingBot:
 
     async def ask_confirm(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Ask for final confirmation"""
+        d = context.user_data['draft']
         chart_url = update.message.text.strip()
 
         if chart_url.lower() == 'skip':
             chart_url = None
 
-        context.user_data['chart_url'] = chart_url
-
-        # Create confirmation keyboard
-        keyboard = [
-            [
-                InlineKeyboardButton("✅ Confirm", callback_data="confirm"),
-                InlineKeyboardButton("❌ Cancel", callback_data="cancel")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        d.chart_url = chart_url
 
         await update.message.reply_text(
-            f"📋 Final Confirmation\n\n"
-            f"{context.user_data['order_type']}: {context.user_data['symbol']}\n"
-            f"ET: {context.user_data['entry']}\n"
-            f"SL: {context.user_data['sl']}\n"
-            f"TP: {context.user_data['tp']}\n"
-            f"Volume: {context.user_data['volume']} lots\n"
-            f"Risk: ${context.user_data['risk_usd']} | R:R: {context.user_data['rr']}\n"
-            f"Emotion: {context.user_data['emotion']} | Setup: {context.user_data['setup_code']}\n"
-            f"Chart: {chart_url or 'None'}\n\n"
-            f"Execute this trade?",
-            reply_markup=reply_markup
+            _CONFIRM_TEXT.format(d=d, chart=chart_url or 'None'),
+            reply_markup=_CONFIRM_KB
         )
 
         return CONFIRM
 
     async def execute_trade(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Execute trade or cancel"""
+        d = context.user_data['draft']
         query = update.callback_query
         await query.answer()
 
@@ -845,128 +1046,188 @@ class TradingBot:
             return ConversationHandler.END
 
         # Get account_id from user settings
-        user_id = context.user_data['user_id']
-        telegram_id = context.user_data['telegram_id']
-        settings = self.db.get_user_settings(user_id)
+        user_id = d.user_id
+        telegram_id = d.telegram_id
+        settings = d.settings
         account_id = settings['default_account_id'] or 1  # Fallback to 1 if not set
 
-        # Show processing message
-        await query.edit_message_text("⏳ Executing trade in MT5...")
-
         # Build trade command
         command = {
             "user_id": user_id,
             "account_id": account_id,
             "telegram_id": telegram_id,
-            "order_type": context.user_data['order_type'],
-            "symbol": context.user_data['symbol'],
-            "entry": context.user_data['entry'],
-            "sl": context.user_data['sl'],
-            "tp": context.user_data['tp'],
-            "volume": context.user_data['volume'],
-            "risk_usd": context.user_data['risk_usd'],
-            "emotion": context.user_data['emotion'],
-            "setup_code": context.user_data['setup_code'],
-            "chart_url": context.user_data['chart_url']
+            "order_type": d.order_type,
+            "symbol": d.symbol,
+            "entry": d.entry,
+            "sl": d.sl,
+            "tp": d.tp,
+            "volume": d.volume,
+            "risk_usd": d.risk_usd,
+            "emotion": d.emotion,
+            "setup_code": d.setup_code,
+            "chart_url": d.chart_url,
+            "rr": d.rr
         }
 
-        # Save to database first
-        trade_id = self.db.create_trade(
-            user_id=user_id,
-            account_id=account_id,
-            symbol=context.user_data['symbol'],
-            order_type=context.user_data['order_type'],
-            entry=context.user_data['entry'],
-            sl=context.user_data['sl'],
-            tp=context.user_data['tp'],
-            volume=context.user_data['volume'],
-            risk_usd=context.user_data['risk_usd'],
-            rr=context.user_data['rr'],
-            emotion=context.user_data['emotion'],
-            setup_code=context.user_data['setup_code'],
-            chart_url=context.user_data['chart_url']
-        )
+        # Journal the trade as pending before it can reach MT5, so an order
+        # the broker fills is never left without a row
+        trade_id = await self._record_trade(command, 'pending')
 
-        # Execute trade in MT5 directly
+        await query.edit_message_text("⏳ Executing trade in MT5...")
+
+        # Hand off to the account's engine worker; it updates the trade and
+        # edits this message once MT5 has answered
         try:
-            # Check MT5 connection
-            if not self.mt5_adapter.connected:
-                logger.warning("MT5 not connected, attempting to connect...")
-                if not self.mt5_adapter.connect():
-                    raise Exception("Failed to connect to MT5. Please ensure MT5 is running and logged in.")
-
-            # Execute trade
-            result = self.mt5_adapter.execute_trade_command(command)
-
-            if result['success']:
-                # Update database with success
-                self.db.update_trade_status(
-                    trade_id=trade_id,
-                    status='filled',
-                    mt5_ticket=result['ticket'],
-                    mt5_open_price=result.get('execution_price'),
-                    mt5_open_time=datetime.utcnow().isoformat()
-                )
+            self._engine_queue(account_id, context.bot).put_nowait(
+                (command, trade_id, query.message.chat_id, query.message.message_id)
+            )
+        except asyncio.QueueFull:
+            await self._finish_trade(command, trade_id, 'failed')
+            await query.edit_message_text(
+                f"❌ Trade #{trade_id} not sent\n\n"
+                f"The trade engine is busy. Please try again in a moment."
+            )
+            logger.error("Engine queue full, trade #%s not sent", trade_id)
 
-                # Send success message
-                await query.edit_message_text(
-                    f"✅ Trade #{trade_id} executed successfully!\n\n"
-                    f"MT5 Ticket: {result['ticket']}\n"
-                    f"{context.user_data['order_type']}: {context.user_data['symbol']}\n"
-                    f"ET: {context.user_data['entry']}\n"
-                    f"SL: {context.user_data['sl']}\n"
-                    f"TP: {context.user_data['tp']}\n"
-                    f"Volume: {result.get('volume', context.user_data['volume'])} lots\n"
-                    f"Risk: ${context.user_data['risk_usd']} | R:R: {context.user_data['rr']}"
-                )
+        return ConversationHandler.END
 
-                logger.info(f"Trade #{trade_id} executed successfully - Ticket: {result['ticket']}")
+    def _engine_queue(self, account_id: int, bot) -> asyncio.Queue:
+        """Get the account's trade queue, starting its worker on first use"""
+        engine_queue = self._engine_queues.get(account_id)
+        if engine_queue is None:
+            engine_queue = self._engine_queues[account_id] = asyncio.Queue(maxsize=ENGINE_QUEUE_MAXSIZE)
+            self._engine_tasks.append(asyncio.create_task(self._engine_worker(engine_queue, bot)))
+        return engine_queue
 
-            else:
-                # Update database with failure
-                self.db.update_trade_status(
-                    trade_id=trade_id,
-                    status='failed'
-                )
+    async def _submit_to_mt5(self, command: dict) -> dict:
+        """
+        Send one trade command to MT5.
 
-                # Send failure message
-                await query.edit_message_text(
-                    f"❌ Trade #{trade_id} failed\n\n"
-                    f"Error: {result['error']}\n\n"
-                    f"Symbol: {context.user_data['symbol']}\n"
-                    f"Type: {context.user_data['order_type']}\n"
-                    f"Entry: {context.user_data['entry']}\n\n"
-                    f"Please check:\n"
-                    f"- Market is open\n"
-                    f"- Symbol exists in MT5\n"
-                    f"- Sufficient margin"
-                )
+        Never connects inline: the heartbeat keeps the session up, so a trade
+        arriving while MT5 is down fails fast instead of waiting on connect().
+        A sent order is never resubmitted, so a broker rejection cannot turn
+        into a duplicate trade.
+        """
+        if not self.mt5_adapter.connected:
+            raise Exception("MT5 is not connected. Please ensure MT5 is running and logged in.")
 
-                logger.error(f"Trade #{trade_id} failed - Error: {result['error']}")
+        return await run_mt5(self.mt5_adapter.execute_trade_command, command)
 
-        except Exception as e:
-            # Update database with failure
-            self.db.update_trade_status(
-                trade_id=trade_id,
-                status='failed'
+    async def _record_trade(self, command: dict, status: str) -> int:
+        """Insert the trade row with its current status"""
+        return await self._adb(
+            self.db.create_trade,
+            status=status,
+            **{name: command[name] for name in _TRADE_FIELDS}
+        )
+
+    async def _finish_trade(self, command: dict, trade_id: int, status: str, **mt5_fields):
+        """
+        Update a pending trade row with its MT5 outcome.
+
+        A failed write is logged rather than raised: the order has already
+        been sent, so the user must still be told what the broker did.
+        """
+        try:
+            await self._adb(self.db.update_trade_status, trade_id, status, **mt5_fields)
+        except Exception:
+            logger.exception(
+                "Could not record trade #%s as %s (MT5 ticket %s): %s",
+                trade_id, status, mt5_fields.get('mt5_ticket'), command
             )
 
+    async def _engine_worker(self, engine_queue: asyncio.Queue, bot):
+        """
+        Submit one account's queued trade commands to MT5 in order.
+
+        order_send stays serial (one terminal session per process), but each
+        outcome is recorded and reported in its own task, so the next order
+        goes out without waiting on SQLite and the Telegram edit.
+        """
+        while True:
+            command, trade_id, chat_id, message_id = await engine_queue.get()
+            try:
+                try:
+                    result, error = await self._submit_to_mt5(command), None
+                except Exception as e:
+                    result, error = None, e
+                report = asyncio.create_task(
+                    self._report_trade(bot, command, trade_id, chat_id, message_id, result, error)
+                )
+                self._report_tasks.add(report)
+                report.add_done_callback(self._on_report_done)
+            finally:
+                engine_queue.task_done()
+
+    def _on_report_done(self, task: asyncio.Task):
+        """Forget a finished report task and log it if it failed"""
+        self._report_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Trade report failed", exc_info=task.exception())
+
+    async def _report_trade(self, bot, command: dict, trade_id: int, chat_id: int,
+                            message_id: int, result: dict, error: Exception):
+        """Record one submitted trade's outcome and edit the user's message"""
+        if error is not None:
+            # Record the failure
+            await self._finish_trade(command, trade_id, 'failed')
+
             # Send error message
-            await query.edit_message_text(
+            await bot.edit_message_text(
                 f"❌ Trade #{trade_id} execution error\n\n"
-                f"Error: {str(e)}\n\n"
-                f"Please ensure:\n"
-                f"- MetaTrader 5 is running\n"
-                f"- You are logged in\n"
-                f"- Market is open\n\n"
-                f"Use /settings to check configuration"
+                f"Error: {str(error)}\n\n"
+                + _EXECUTION_ERROR_HELP_TEXT,
+                chat_id=chat_id,
+                message_id=message_id
             )
 
-            logger.exception(f"Error executing trade #{trade_id}")
+            logger.error("Error executing trade #%s", trade_id, exc_info=error)
+            return
 
-        return ConversationHandler.END
+        if result['success']:
+            # Record the fill
+            await self._finish_trade(
+                command,
+                trade_id,
+                'filled',
+                mt5_ticket=result['ticket'],
+                mt5_open_price=result.get('execution_price'),
+                mt5_open_time=time.time_ns() // 1000  # epoch microseconds
+            )
 
+            # Send success message
+            await bot.edit_message_text(
+                f"✅ Trade #{trade_id} executed successfully!\n\n"
+                f"MT5 Ticket: {result['ticket']}\n"
+                f"{command['order_type']}: {command['symbol']}\n"
+                f"ET: {command['entry']}\n"
+                f"SL: {command['sl']}\n"
+                f"TP: {command['tp']}\n"
+                f"Volume: {result.get('volume', command['volume'])} lots\n"
+                f"Risk: ${command['risk_usd']} | R:R: {command['rr']}",
+                chat_id=chat_id,
+                message_id=message_id
+            )
+
+            logger.info("Trade #%s executed successfully - Ticket: %s", trade_id, result['ticket'])
+
+        else:
+            # Record the failure
+            await self._finish_trade(command, trade_id, 'failed')
+
+            # Send failure message
+            await bot.edit_message_text(
+                f"❌ Trade #{trade_id} failed\n\n"
+                f"Error: {result['error']}\n\n"
+                f"Symbol: {command['symbol']}\n"
+                f"Type: {command['order_type']}\n"
+                f"Entry: {command['entry']}\n\n"
+                + _TRADE_FAILED_HELP_TEXT,
+                chat_id=chat_id,
+                message_id=message_id
+            )
 
+            logger.error("Trade #%s failed - Error: %s", trade_id, result['error'])
 
 
 if __name__ == "__main__":
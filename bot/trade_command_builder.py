@@ -15,8 +15,8 @@ class TradeCommandBuilder:
     The command is sent from Telegram Bot to Trade Engine for execution.
     """
 
-    VALID_ORDER_TYPES = ["LIMIT_BUY", "LIMIT_SELL"]
-    VALID_EMOTIONS = ["calm", "confident", "fomo", "stressed", "revenge"]
+    VALID_ORDER_TYPES = frozenset({"LIMIT_BUY", "LIMIT_SELL"})
+    VALID_EMOTIONS = frozenset({"calm", "confident", "fomo", "stressed", "revenge"})
 
     def build_command(
         self,
@@ -60,11 +60,11 @@ class TradeCommandBuilder:
         """
         # Validate order type
         if order_type not in self.VALID_ORDER_TYPES:
-            raise ValueError(f"Invalid order_type: {order_type}. Must be one of {self.VALID_ORDER_TYPES}")
+            raise ValueError(f"Invalid order_type: {order_type}. Must be one of {sorted(self.VALID_ORDER_TYPES)}")
 
         # Validate emotion
         if emotion not in self.VALID_EMOTIONS:
-            raise ValueError(f"Invalid emotion: {emotion}. Must be one of {self.VALID_EMOTIONS}")
+            raise ValueError(f"Invalid emotion: {emotion}. Must be one of {sorted(self.VALID_EMOTIONS)}")
 
         # Validate volume
         if volume <= 0:
@@ -89,7 +89,7 @@ class TradeCommandBuilder:
             "emotion": emotion,
             "setup_code": setup_code,
             "chart_url": chart_url,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc).isoformat(timespec='milliseconds')
         }
 
         return command
@@ -0,0 +1,81 @@
+"""
+Per-Chat Update Processor
+
+Lets python-telegram-bot process updates from different chats concurrently
+while keeping updates from the same chat strictly in order, so one user's
+slow trade execution no longer stalls every other chat.
+"""
+
+import asyncio
+import logging
+
+from telegram import Update
+from telegram.error import TelegramError
+from telegram.ext import BaseUpdateProcessor
+
+logger = logging.getLogger(__name__)
+
+
+class PerChatUpdateProcessor(BaseUpdateProcessor):
+    """
+    Runs updates concurrently across chats, sequentially within a chat.
+
+    Each chat gets an asyncio.Lock that lives only while that chat has
+    updates in flight, so idle chats cost nothing.
+
+    Updates waiting on a chat lock still hold one of the global slots, so a
+    chat may only have max_pending_per_chat updates in flight; further
+    updates from a flooding chat are dropped instead of starving the rest.
+    A dropped button press is answered with a "busy" alert so the button
+    does not keep spinning and the user knows to press it again.
+    """
+
+    def __init__(self, max_concurrent_updates: int = 256, max_pending_per_chat: int = 8):
+        """
+        Initialize processor.
+
+        Args:
+            max_concurrent_updates: Upper bound on updates processed at once
+            max_pending_per_chat: Upper bound on one chat's updates in flight
+        """
+        super().__init__(max_concurrent_updates)
+        self._max_pending_per_chat = max_pending_per_chat
+        # chat_id -> [lock, updates in flight]
+        self._chat_locks = {}
+
+    async def do_process_update(self, update: object, coroutine) -> None:
+        """Await the handler coroutine under the update's chat lock"""
+        chat = update.effective_chat if isinstance(update, Update) else None
+        if chat is None:
+            await coroutine
+            return
+
+        entry = self._chat_locks.get(chat.id)
+        if entry is None:
+            entry = self._chat_locks[chat.id] = [asyncio.Lock(), 0]
+        elif entry[1] >= self._max_pending_per_chat:
+            coroutine.close()  # Never awaited: drop the update
+            logger.warning("Chat %s has %d updates in flight, dropping update", chat.id, entry[1])
+            if update.callback_query is not None:
+                try:
+                    await update.callback_query.answer(
+                        "⏳ Busy, please try again in a moment.", show_alert=True
+                    )
+                except TelegramError as e:
+                    logger.warning("Could not answer dropped callback query: %s", e)
+            return
+        entry[1] += 1
+
+        try:
+            async with entry[0]:
+                await coroutine
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._chat_locks[chat.id]
+
+    async def initialize(self) -> None:
+        """Nothing to set up"""
+
+    async def shutdown(self) -> None:
+        """Nothing to tear down"""
@@ -0,0 +1,112 @@
+"""
+User Cache
+
+In-process TTL caches for the user and settings rows that handlers read on
+every conversation step. Writers call the invalidate_* helpers so changes
+are visible immediately instead of after the TTL.
+"""
+
+import time
+
+USER_CACHE_TTL = 60  # seconds
+USER_CACHE_MAXSIZE = 10000
+
+
+class TTLCache:
+    """Minimal dict-backed cache with per-entry expiry and a size cap"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = {}
+
+    def get(self, key):
+        """Return cached value, or None if missing or expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            self._data.pop(key, None)
+            return None
+        return entry[0]
+
+    def set(self, key, value):
+        """Store value; evicts the oldest entry when full"""
+        if key not in self._data and len(self._data) >= self.maxsize:
+            self._data.pop(next(iter(self._data)), None)
+        self._data[key] = (value, time.monotonic() + self.ttl)
+
+    def pop(self, key):
+        """Drop one entry"""
+        self._data.pop(key, None)
+
+    def clear(self):
+        """Drop all entries"""
+        self._data.clear()
+
+
+# telegram_id -> users row
+_user_cache = TTLCache(USER_CACHE_MAXSIZE, USER_CACHE_TTL)
+# user_id -> user_settings row
+_settings_cache = TTLCache(USER_CACHE_MAXSIZE, USER_CACHE_TTL)
+# user_id -> tuple of active (setup_code, setup_name) rows
+_setups_cache = TTLCache(USER_CACHE_MAXSIZE, USER_CACHE_TTL)
+
+
+def cached_user(telegram_id: int):
+    """Return cached user row without touching the database (None on miss)"""
+    return _user_cache.get(telegram_id)
+
+
+def cached_settings(user_id: int):
+    """Return cached settings row without touching the database (None on miss)"""
+    return _settings_cache.get(user_id)
+
+
+def cached_setups(user_id: int):
+    """Return cached setup rows without touching the database (None on miss)"""
+    return _setups_cache.get(user_id)
+
+
+def get_user(db, telegram_id: int):
+    """Get user row by Telegram ID (cached; misses are not cached)"""
+    user = _user_cache.get(telegram_id)
+    if user is None:
+        user = db.get_user_by_telegram_id(telegram_id)
+        if user is not None:
+            _user_cache.set(telegram_id, user)
+    return user
+
+
+def get_settings(db, user_id: int):
+    """Get user settings row (cached; misses are not cached)"""
+    settings = _settings_cache.get(user_id)
+    if settings is None:
+        settings = db.get_user_settings(user_id)
+        if settings is not None:
+            _settings_cache.set(user_id, settings)
+    return settings
+
+
+def get_setups(db, user_id: int):
+    """Get active setups as an immutable tuple (cached, including empty results)"""
+    setups = _setups_cache.get(user_id)
+    if setups is None:
+        setups = tuple(db.get_user_setups_minimal(user_id))
+        _setups_cache.set(user_id, setups)
+    return setups
+
+
+def invalidate_user(telegram_id: int):
+    """Drop cached user row for a Telegram user"""
+    _user_cache.pop(telegram_id)
+
+
+def invalidate_settings(user_id: int):
+    """Drop cached settings row after a settings update"""
+    _settings_cache.pop(user_id)
+
+
+def invalidate_setups(user_id: int):
+    """Drop cached setup list after /addsetup, /editsetup or /deletesetup"""
+    _setups_cache.pop(user_id)
@@ -0,0 +1,125 @@
+"""
+Write Queue
+
+Coalesces small SQLite writes issued by concurrent handlers into batches.
+A single worker task drains the queue and flushes each batch as one transaction,
+using executemany for consecutive writes that share the same SQL.
+"""
+
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class WriteQueue:
+    """
+    Batches writes to the shared DatabaseManager.
+
+    Handlers call `await write_queue.submit(sql, params)`; the call returns once the
+    batch containing the write has been committed (or raises if it failed).
+    """
+
+    def __init__(self, db, max_batch: int = 32, max_wait: float = 0.01):
+        """
+        Initialize write queue.
+
+        Args:
+            db: Shared DatabaseManager
+            max_batch: Flush as soon as this many writes are pending
+            max_wait: Max seconds to wait for more writes after the first one
+        """
+        self.db = db
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = None
+        self._worker = None
+
+    async def submit(self, sql: str, params: tuple):
+        """Queue a write and wait until it is committed"""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((sql, params, future))
+        return await future
+
+    async def close(self):
+        """Flush pending writes and stop the worker"""
+        if self._worker is None:
+            return
+
+        await self._queue.join()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    async def _run(self):
+        """Worker loop: collect a batch, then flush it"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._flush(batch)
+
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _flush(self, batch: list):
+        """Commit one batch, resolving each submitter's future"""
+        # Group consecutive writes with identical SQL (keeps submit order)
+        groups = []
+        for sql, params, _ in batch:
+            if groups and groups[-1][0] == sql:
+                groups[-1][1].append(params)
+            else:
+                groups.append((sql, [params]))
+
+        try:
+            # Off the event loop; DatabaseManager gives each thread its own connection
+            await asyncio.to_thread(self.db.execute_batches, groups)
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error("Write failed: %s", e)
+                self._resolve(batch[0][2], e)
+                return
+            # The batch rolled back as a whole: retry each write on its own so
+            # only the writes that actually fail report an error
+            logger.warning("Write batch of %d failed (%s), retrying writes one by one", len(batch), e)
+            for sql, params, future in batch:
+                try:
+                    await asyncio.to_thread(self.db.execute_batches, [(sql, [params])])
+                except Exception as item_error:
+                    logger.error("Write failed: %s", item_error)
+                    self._resolve(future, item_error)
+                else:
+                    self._resolve(future)
+            return
+
+        for _, _, future in batch:
+            self._resolve(future)
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, error: Exception = None):
+        """Complete a submitter's future (unless it was cancelled)"""
+        if future.done():
+            return
+        if error is None:
+            future.set_result(None)
+        else:
+            future.set_exception(error)
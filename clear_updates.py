@@ -6,11 +6,11 @@ This script drops all pending updates in the Telegram queue
 to prevent rate limiting issues on bot restart.
 """
 
+import json
 import os
 import sys
 from dotenv import load_dotenv
-import requests
-import time
+import urllib3
 
 # Load environment variables
 load_dotenv()
@@ -22,23 +22,43 @@ if not BOT_TOKEN:
     print("❌ Error: TELEGRAM_BOT_TOKEN not found in .env file")
     sys.exit(1)
 
+API_BASE = f"https://api.telegram.org/bot{BOT_TOKEN}"
+
+# getUpdates `timeout` (server-side long poll). This script only inspects and
+# acknowledges what is already queued, so it asks Telegram to answer at once;
+# the HTTP timeout must stay above the API timeout or valid polls get cut off.
+POLL_TIMEOUT = 0
+HTTP_TIMEOUT = POLL_TIMEOUT + 10
+
+# One keep-alive pool for every call: the second request reuses the
+# TLS connection of the first. 429 is handled below, so it isn't retried here.
+POOL = urllib3.PoolManager(
+    num_pools=1,
+    maxsize=4,
+    timeout=urllib3.Timeout(connect=5, read=HTTP_TIMEOUT),
+    retries=urllib3.Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+)
+
+
+def get_updates(**params):
+    """Call getUpdates and return (HTTP status, decoded JSON body)"""
+    response = POOL.request('GET', f"{API_BASE}/getUpdates", fields=params)
+    return response.status, json.loads(response.data)
+
+
 print(f"🤖 Bot Token: {BOT_TOKEN[:10]}...{BOT_TOKEN[-5:]}")
 print("\n🔄 Clearing pending updates...\n")
 
 try:
     # Get pending updates
-    url = f"https://api.telegram.org/bot{BOT_TOKEN}/getUpdates"
-    response = requests.get(url, timeout=10)
+    status, data = get_updates(timeout=POLL_TIMEOUT)
 
-    if response.status_code == 429:
-        retry_after = response.json().get('parameters', {}).get('retry_after', 10)
+    if status == 429:
+        retry_after = data.get('parameters', {}).get('retry_after', 10)
         print(f"⚠️  Bot is rate limited. Need to wait {retry_after} seconds...")
         print(f"   Please wait and run this script again after {retry_after}s")
         sys.exit(1)
 
-    response.raise_for_status()
-    data = response.json()
-
     if not data.get('ok'):
         print(f"❌ Error: {data.get('description', 'Unknown error')}")
         sys.exit(1)
@@ -63,17 +83,18 @@ try:
         print("❌ Cancelled")
         sys.exit(0)
 
-    # Drop all updates by acknowledging with offset
-    offset = last_update_id + 1
-    clear_url = f"https://api.telegram.org/bot{BOT_TOKEN}/getUpdates?offset={offset}"
-    clear_response = requests.get(clear_url, timeout=10)
-    clear_response.raise_for_status()
+    # Drop all updates by acknowledging with offset (limit=1: the reply
+    # carries at most one update that arrived meanwhile, not a full batch)
+    status, clear_data = get_updates(offset=last_update_id + 1, limit=1, timeout=POLL_TIMEOUT)
+    if not clear_data.get('ok'):
+        print(f"❌ Error: {clear_data.get('description', f'HTTP {status}')}")
+        sys.exit(1)
 
     print(f"\n✅ Cleared {len(updates)} pending updates")
     print("   Bot is ready to start fresh!")
     print("\n💡 Wait 10 seconds before starting the bot")
 
-except requests.exceptions.RequestException as e:
+except urllib3.exceptions.HTTPError as e:
     print(f"❌ Network error: {e}")
     sys.exit(1)
 except Exception as e:
@@ -7,9 +7,116 @@ Thread-safe implementation using threading.local() for concurrent access.
 
 import sqlite3
 import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 
 
+# Lightweight row type for the symbol settings hot path (tuple speed, attribute access)
+SymbolSettings = namedtuple('SymbolSettings', ['base', 'prefix', 'suffix'])
+
+
+@lru_cache(maxsize=32)
+def _record_class(columns: tuple):
+    """
+    namedtuple type for a result column set.
+
+    Records keep sqlite3.Row-style access (row['col'], row[0], row.keys())
+    and add attribute access (row.col) at tuple cost.
+    """
+    base = namedtuple('Record', columns, rename=True)
+    index = {name: i for i, name in enumerate(columns)}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            key = index[key]  # KeyError for unknown columns, like sqlite3.Row
+        return tuple.__getitem__(self, key)
+
+    return type('Record', (base,), {
+        '__slots__': (),
+        '__getitem__': __getitem__,
+        'keys': lambda self: list(columns),
+    })
+
+
+@lru_cache(maxsize=64)
+def _insert_sql(table: str, fields: tuple) -> str:
+    """
+    INSERT statement for a table and a (sorted) column tuple.
+
+    The same column set always yields the identical string object, so
+    sqlite3's per-connection statement cache reuses the prepared statement.
+    """
+    return f"INSERT INTO {table} ({', '.join(fields)}) VALUES ({', '.join('?' * len(fields))})"
+
+
+@lru_cache(maxsize=64)
+def _update_sql(table: str, fields: tuple, key_column: str) -> str:
+    """UPDATE statement for a table, a (sorted) column tuple and the WHERE key column"""
+    return f"UPDATE {table} SET {', '.join(f'{field} = ?' for field in fields)} WHERE {key_column} = ?"
+
+
+@lru_cache(maxsize=1)
+def _schema_sql() -> str:
+    """Contents of schema.sql, read once per process"""
+    return (Path(__file__).parent / "schema.sql").read_text()
+
+
+def _record_factory(cursor, row):
+    """Cursor row_factory producing Record namedtuples"""
+    return _record_class(tuple(col[0] for col in cursor.description))._make(row)
+
+
+# Hot-path statements, kept as constants so every call hands sqlite3 the
+# identical string and hits the connection's statement cache
+GET_USER_SQL = "SELECT * FROM users WHERE telegram_id = ?"
+GET_USER_SETTINGS_SQL = "SELECT * FROM user_settings WHERE user_id = ?"
+GET_SYMBOL_SETTINGS_SQL = (
+    "SELECT default_symbol_base, symbol_prefix, symbol_suffix FROM user_settings WHERE user_id = ?"
+)
+GET_SETUPS_MINIMAL_SQL = "SELECT setup_code, setup_name FROM setups WHERE user_id = ? AND is_active = 1"
+GET_SETUPS_BY_TELEGRAM_ID_SQL = """
+    SELECT s.id, s.setup_code, s.setup_name
+    FROM setups s
+    JOIN users u ON s.user_id = u.id
+    WHERE u.telegram_id = ? AND s.is_active = 1
+"""
+SETUP_CODE_EXISTS_SQL = "SELECT 1 FROM setups WHERE user_id = ? AND setup_code = ? LIMIT 1"
+CREATE_USER_SQL = "INSERT INTO users (telegram_id, username, first_name, last_name) VALUES (?, ?, ?, ?)"
+CREATE_DEFAULT_SETTINGS_SQL = "INSERT INTO user_settings (user_id) VALUES (?)"
+
+# create_trade / create_trades_bulk must receive at least these columns
+REQUIRED_TRADE_FIELDS = frozenset({
+    'user_id', 'account_id', 'symbol', 'order_type', 'entry',
+    'sl', 'tp', 'volume', 'risk_usd', 'emotion', 'setup_code'
+})
+# Columns update_user_settings may change (others are ignored)
+SETTINGS_FIELDS = frozenset({
+    'default_symbol_base', 'symbol_prefix', 'symbol_suffix',
+    'default_order_type', 'risk_type', 'risk_value', 'default_rr_ratio', 'default_account_id'
+})
+# update_trade_statuses: optional execution columns, each kept when passed None
+TRADE_STATUS_MT5_FIELDS = (
+    'mt5_ticket', 'mt5_open_price', 'mt5_open_time',
+    'mt5_close_price', 'mt5_close_time', 'mt5_profit'
+)
+UPDATE_TRADE_STATUS_SQL = (
+    "UPDATE trades SET status = ?, "
+    + "".join(f"{column} = COALESCE(?, {column}), " for column in TRADE_STATUS_MT5_FIELDS)
+    + "updated_at = CURRENT_TIMESTAMP WHERE id = ?"
+)
+# Bound parameters per statement on older SQLite builds (SQLITE_MAX_VARIABLE_NUMBER)
+SQLITE_MAX_VARIABLES = 999
+
+# Fixed SQL text per editable setup field, so sqlite3's statement cache is reused
+SETUP_FIELD_UPDATE_SQL = {
+    'name': "UPDATE setups SET setup_name = ? WHERE id = ? AND user_id = ?",
+    'description': "UPDATE setups SET description = ? WHERE id = ? AND user_id = ?",
+}
+DEACTIVATE_SETUP_SQL = "UPDATE setups SET is_active = 0 WHERE id = ? AND user_id = ?"
+
+
 class DatabaseManager:
     """
     Thread-safe database manager for SQLite.
@@ -27,6 +134,9 @@ class DatabaseManager:
         """
         self.db_path = db_path
         self._local = threading.local()
+        # Every per-thread connection opened so far, so shutdown can close them all
+        self._all_conns = []
+        self._all_conns_lock = threading.Lock()
 
     def connect(self):
         """
@@ -40,12 +150,39 @@ class DatabaseManager:
             self._local.conn = sqlite3.connect(
                 self.db_path,
                 check_same_thread=False,  # Allow usage across threads
-                timeout=30.0  # Wait up to 30s for lock instead of failing immediately
+                timeout=30.0,  # Wait up to 30s for lock instead of failing immediately
+                cached_statements=256  # Keep compiled statements for all hot queries
             )
             self._local.conn.row_factory = sqlite3.Row  # Enable dict-like access
+            # WAL lets the per-thread connections read concurrently while one writes;
+            # synchronous=NORMAL is durable in WAL mode and avoids an fsync per commit.
+            # mmap and a 64 MiB page cache keep the (small) database in memory.
+            self._local.conn.executescript(
+                "PRAGMA journal_mode=WAL;"
+                "PRAGMA synchronous=NORMAL;"
+                "PRAGMA temp_store=MEMORY;"
+                "PRAGMA mmap_size=268435456;"
+                "PRAGMA cache_size=-65536;"
+            )
+            with self._all_conns_lock:
+                self._all_conns.append(self._local.conn)
+            # Reused by the read helpers instead of a new cursor per call
+            self._local.cursor = self._local.conn.cursor()
+            self._local.record_cursor = self._local.conn.cursor()
+            self._local.record_cursor.row_factory = _record_factory
 
         return self._local.conn
 
+    def _cursor(self):
+        """This thread's shared cursor (sqlite3.Row rows)"""
+        self.connect()
+        return self._local.cursor
+
+    def _record_cursor(self):
+        """This thread's shared cursor producing Record rows"""
+        self.connect()
+        return self._local.record_cursor
+
     @property
     def conn(self):
         """
@@ -56,79 +193,121 @@ class DatabaseManager:
 
     def initialize_schema(self):
         """Create tables from schema.sql if they don't exist"""
-        schema_path = Path(__file__).parent / "schema.sql"
+        cursor = self.conn.cursor()
+        cursor.executescript(_schema_sql())
 
-        with open(schema_path, 'r') as f:
-            schema_sql = f.read()
+        # Databases created before setups.updated_at existed: the timestamp
+        # trigger needs the column (ALTER TABLE only allows constant defaults)
+        cursor.execute("PRAGMA table_info(setups)")
+        if 'updated_at' not in [col[1] for col in cursor.fetchall()]:
+            cursor.execute("ALTER TABLE setups ADD COLUMN updated_at TIMESTAMP")
 
-        cursor = self.conn.cursor()
-        cursor.executescript(schema_sql)
         self.conn.commit()
 
     def close(self):
         """Close current thread's database connection"""
         if hasattr(self._local, 'conn') and self._local.conn:
+            with self._all_conns_lock:
+                self._all_conns.remove(self._local.conn)
             self._local.conn.close()
             self._local.conn = None
 
-    def get_user_by_telegram_id(self, telegram_id: int):
-        """Get user by Telegram ID"""
+    def close_all(self):
+        """
+        Close every thread's connection.
+
+        Call on shutdown, after worker threads have stopped using the manager.
+        """
+        with self._all_conns_lock:
+            conns, self._all_conns = self._all_conns, []
+        for conn in conns:
+            conn.close()
+        self._local.conn = None
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run several statements as one transaction (one commit).
+
+        Yields a cursor; commits when the block exits and rolls back if it
+        raises. The single-statement helpers below each commit on their own,
+        so hot paths issuing several writes should group them here instead:
+
+            with db.transaction() as cursor:
+                cursor.execute(...)
+                cursor.execute(...)
+        """
         cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE telegram_id = ?", (telegram_id,))
+        try:
+            yield cursor
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def get_user_by_telegram_id(self, telegram_id: int):
+        """Get user by Telegram ID (Record: user.id or user['id'])"""
+        cursor = self._record_cursor()
+        cursor.execute(GET_USER_SQL, (telegram_id,))
         return cursor.fetchone()
 
     def create_user(self, telegram_id: int, username: str = None,
                     first_name: str = None, last_name: str = None):
         """Create new user"""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "INSERT INTO users (telegram_id, username, first_name, last_name) VALUES (?, ?, ?, ?)",
-            (telegram_id, username, first_name, last_name)
-        )
-        self.conn.commit()
-        return cursor.lastrowid
+        with self.transaction() as cursor:
+            cursor.execute(CREATE_USER_SQL, (telegram_id, username, first_name, last_name))
+            return cursor.lastrowid
+
+    def register_user(self, telegram_id: int, username: str = None,
+                      first_name: str = None, last_name: str = None):
+        """Create a user and their default settings in one transaction"""
+        with self.transaction() as cursor:
+            cursor.execute(CREATE_USER_SQL, (telegram_id, username, first_name, last_name))
+            user_id = cursor.lastrowid
+            cursor.execute(CREATE_DEFAULT_SETTINGS_SQL, (user_id,))
+        return user_id
 
     def get_user_settings(self, user_id: int):
-        """Get user settings"""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM user_settings WHERE user_id = ?", (user_id,))
+        """Get user settings (Record: settings.risk_value or settings['risk_value'])"""
+        cursor = self._record_cursor()
+        cursor.execute(GET_USER_SETTINGS_SQL, (user_id,))
         return cursor.fetchone()
 
+    def get_user_symbol_settings(self, user_id: int):
+        """
+        Get only the symbol settings for a user.
+
+        Returns:
+            SymbolSettings(base, prefix, suffix) or None if user has no settings
+        """
+        cursor = self._cursor()
+        cursor.execute(GET_SYMBOL_SETTINGS_SQL, (user_id,))
+        row = cursor.fetchone()
+        return SymbolSettings(*row) if row else None
+
     def create_default_settings(self, user_id: int):
         """Create default settings for new user"""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "INSERT INTO user_settings (user_id) VALUES (?)",
-            (user_id,)
-        )
-        self.conn.commit()
+        with self.transaction() as cursor:
+            cursor.execute(CREATE_DEFAULT_SETTINGS_SQL, (user_id,))
 
     def update_user_settings(self, user_id: int, **kwargs):
         """Update user settings"""
-        valid_fields = [
-            'default_symbol_base', 'symbol_prefix', 'symbol_suffix',
-            'default_order_type', 'risk_type', 'risk_value', 'default_rr_ratio', 'default_account_id'
-        ]
+        fields = tuple(sorted(field for field in kwargs if field in SETTINGS_FIELDS))
 
-        updates = {k: v for k, v in kwargs.items() if k in valid_fields}
-
-        if not updates:
+        if not fields:
             return
 
-        set_clause = ", ".join([f"{k} = ?" for k in updates.keys()])
-        values = list(updates.values())
-        values.append(user_id)
-
-        cursor = self.conn.cursor()
-        cursor.execute(
-            f"UPDATE user_settings SET {set_clause} WHERE user_id = ?",
-            values
-        )
-        self.conn.commit()
+        with self.transaction() as cursor:
+            cursor.execute(
+                _update_sql('user_settings', fields, 'user_id'),
+                [kwargs[field] for field in fields] + [user_id]
+            )
 
     def get_user_setups(self, user_id: int, active_only: bool = True):
         """Get user's trade setups"""
-        cursor = self.conn.cursor()
+        cursor = self._cursor()
 
         if active_only:
             cursor.execute(
@@ -140,16 +319,44 @@ class DatabaseManager:
 
         return cursor.fetchall()
 
+    def get_user_setups_minimal(self, user_id: int):
+        """Get active setups with only the columns needed for lists/keyboards"""
+        cursor = self._cursor()
+        cursor.execute(GET_SETUPS_MINIMAL_SQL, (user_id,))
+        return cursor.fetchall()
+
+    def get_setups_by_telegram_id(self, telegram_id: int):
+        """Get active setups for a Telegram user in one query (users JOIN setups)"""
+        cursor = self._cursor()
+        cursor.execute(GET_SETUPS_BY_TELEGRAM_ID_SQL, (telegram_id,))
+        return cursor.fetchall()
+
+    def setup_code_exists(self, user_id: int, setup_code: str) -> bool:
+        """Check if user already has a setup with this code (active or not)"""
+        cursor = self._cursor()
+        cursor.execute(SETUP_CODE_EXISTS_SQL, (user_id, setup_code))
+        return cursor.fetchone() is not None
+
     def create_setup(self, user_id: int, setup_code: str,
                     setup_name: str, description: str = None):
         """Create new trade setup"""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "INSERT INTO setups (user_id, setup_code, setup_name, description) VALUES (?, ?, ?, ?)",
-            (user_id, setup_code, setup_name, description)
-        )
-        self.conn.commit()
-        return cursor.lastrowid
+        with self.transaction() as cursor:
+            cursor.execute(
+                "INSERT INTO setups (user_id, setup_code, setup_name, description) VALUES (?, ?, ?, ?)",
+                (user_id, setup_code, setup_name, description)
+            )
+            return cursor.lastrowid
+
+    def execute_batches(self, groups: list):
+        """
+        Run several write batches in a single transaction.
+
+        Args:
+            groups: List of (sql, params_list) pairs, each run via executemany
+        """
+        with self.conn:
+            for sql, params_list in groups:
+                self.conn.executemany(sql, params_list)
 
     def create_trade(self, **kwargs):
         """
@@ -159,42 +366,63 @@ class DatabaseManager:
         - user_id, account_id, symbol, order_type, entry, sl, tp,
           volume, risk_usd, emotion, setup_code
         """
-        required_fields = [
-            'user_id', 'account_id', 'symbol', 'order_type', 'entry',
-            'sl', 'tp', 'volume', 'risk_usd', 'emotion', 'setup_code'
-        ]
+        missing = REQUIRED_TRADE_FIELDS - kwargs.keys()
+        if missing:
+            raise ValueError(f"Missing required fields: {sorted(missing)}")
 
-        for field in required_fields:
-            if field not in kwargs:
-                raise ValueError(f"Missing required field: {field}")
+        fields = tuple(sorted(kwargs))
 
-        fields = list(kwargs.keys())
-        placeholders = ", ".join(["?" for _ in fields])
-        field_names = ", ".join(fields)
+        with self.transaction() as cursor:
+            cursor.execute(_insert_sql('trades', fields), [kwargs[field] for field in fields])
+            return cursor.lastrowid
 
-        cursor = self.conn.cursor()
-        cursor.execute(
-            f"INSERT INTO trades ({field_names}) VALUES ({placeholders})",
-            list(kwargs.values())
-        )
-        self.conn.commit()
-        return cursor.lastrowid
+    def create_trades_bulk(self, rows: list):
+        """
+        Insert many trade records in one transaction.
+
+        Every row must have the same keys, including create_trade's required
+        fields. Rows are written with multi-row INSERT ... VALUES (...), (...)
+        statements, chunked to stay under SQLite's 999 bound-parameter limit.
+
+        Returns:
+            Number of rows inserted
+        """
+        if not rows:
+            return 0
+
+        fields = sorted(rows[0])
+        missing = REQUIRED_TRADE_FIELDS - rows[0].keys()
+        if missing:
+            raise ValueError(f"Missing required fields: {sorted(missing)}")
+        field_set = set(fields)
+        if any(row.keys() != field_set for row in rows):
+            raise ValueError("All rows must have the same fields")
+
+        row_placeholders = "(" + ", ".join("?" * len(fields)) + ")"
+        insert_prefix = f"INSERT INTO trades ({', '.join(fields)}) VALUES "
+        rows_per_chunk = SQLITE_MAX_VARIABLES // len(fields)
+
+        with self.conn:
+            for start in range(0, len(rows), rows_per_chunk):
+                chunk = rows[start:start + rows_per_chunk]
+                self.conn.execute(
+                    insert_prefix + ", ".join([row_placeholders] * len(chunk)),
+                    [row[field] for row in chunk for field in fields]
+                )
+        return len(rows)
 
     def update_trade(self, trade_id: int, **kwargs):
         """Update trade record"""
         if not kwargs:
             return
 
-        set_clause = ", ".join([f"{k} = ?" for k in kwargs.keys()])
-        values = list(kwargs.values())
-        values.append(trade_id)
+        fields = tuple(sorted(kwargs))
 
-        cursor = self.conn.cursor()
-        cursor.execute(
-            f"UPDATE trades SET {set_clause} WHERE id = ?",
-            values
-        )
-        self.conn.commit()
+        with self.transaction() as cursor:
+            cursor.execute(
+                _update_sql('trades', fields, 'id'),
+                [kwargs[field] for field in fields] + [trade_id]
+            )
 
     def update_trade_status(
         self,
@@ -202,9 +430,9 @@ class DatabaseManager:
         status: str,
         mt5_ticket: int = None,
         mt5_open_price: float = None,
-        mt5_open_time: str = None,
+        mt5_open_time: int = None,
         mt5_close_price: float = None,
-        mt5_close_time: str = None,
+        mt5_close_time: int = None,
         mt5_profit: float = None
     ):
         """
@@ -215,24 +443,32 @@ class DatabaseManager:
             status: Trade status ('pending', 'filled', 'closed', 'cancelled', 'failed')
             mt5_ticket: MT5 order ticket number
             mt5_open_price: Actual MT5 open price
-            mt5_open_time: MT5 open timestamp
+            mt5_open_time: MT5 open time (epoch microseconds, UTC)
             mt5_close_price: MT5 close price
-            mt5_close_time: MT5 close timestamp
+            mt5_close_time: MT5 close time (epoch microseconds, UTC)
             mt5_profit: MT5 profit/loss
         """
-        updates = {'status': status, 'updated_at': 'CURRENT_TIMESTAMP'}
-
-        if mt5_ticket is not None:
-            updates['mt5_ticket'] = mt5_ticket
-        if mt5_open_price is not None:
-            updates['mt5_open_price'] = mt5_open_price
-        if mt5_open_time is not None:
-            updates['mt5_open_time'] = mt5_open_time
-        if mt5_close_price is not None:
-            updates['mt5_close_price'] = mt5_close_price
-        if mt5_close_time is not None:
-            updates['mt5_close_time'] = mt5_close_time
-        if mt5_profit is not None:
-            updates['mt5_profit'] = mt5_profit
-
-        self.update_trade(trade_id, **updates)
+        self.update_trade_statuses([(trade_id, {
+            'status': status,
+            'mt5_ticket': mt5_ticket,
+            'mt5_open_price': mt5_open_price,
+            'mt5_open_time': mt5_open_time,
+            'mt5_close_price': mt5_close_price,
+            'mt5_close_time': mt5_close_time,
+            'mt5_profit': mt5_profit,
+        })])
+
+    def update_trade_statuses(self, updates: list):
+        """
+        Update execution status for many trades in one transaction.
+
+        Args:
+            updates: List of (trade_id, fields) pairs. fields needs 'status'
+                and may hold any update_trade_status mt5_* field; missing
+                or None fields keep their stored value.
+        """
+        with self.transaction() as cursor:
+            cursor.executemany(UPDATE_TRADE_STATUS_SQL, [
+                (fields['status'], *(fields.get(column) for column in TRADE_STATUS_MT5_FIELDS), trade_id)
+                for trade_id, fields in updates
+            ])
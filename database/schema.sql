@@ -50,9 +50,10 @@ CREATE TABLE IF NOT EXISTS setups (
     user_id INTEGER NOT NULL,
     setup_code TEXT NOT NULL,
     setup_name TEXT NOT NULL,
-    description TEXT,
+    description TEXT CHECK(length(description) <= 500),
     is_active BOOLEAN DEFAULT 1,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     UNIQUE(user_id, setup_code)
 );
@@ -84,8 +85,8 @@ CREATE TABLE IF NOT EXISTS trades (
     mt5_ticket INTEGER,
     mt5_open_price REAL,
     mt5_close_price REAL,
-    mt5_open_time TIMESTAMP,
-    mt5_close_time TIMESTAMP,
+    mt5_open_time INTEGER,   -- epoch microseconds (UTC)
+    mt5_close_time INTEGER,  -- epoch microseconds (UTC)
     mt5_profit REAL,
 
     -- Status tracking
@@ -108,7 +109,9 @@ CREATE INDEX IF NOT EXISTS idx_trades_created_at ON trades(created_at);
 CREATE INDEX IF NOT EXISTS idx_trades_emotion ON trades(emotion);
 CREATE INDEX IF NOT EXISTS idx_trades_setup_code ON trades(setup_code);
 CREATE INDEX IF NOT EXISTS idx_setups_user_id ON setups(user_id);
+CREATE INDEX IF NOT EXISTS idx_setups_user_is_active ON setups(user_id, is_active);
 CREATE INDEX IF NOT EXISTS idx_accounts_user_id ON accounts(user_id);
+CREATE INDEX IF NOT EXISTS idx_user_settings_user_id ON user_settings(user_id);
 
 -- Trigger to update updated_at timestamp
 CREATE TRIGGER IF NOT EXISTS update_users_timestamp
@@ -123,6 +126,12 @@ BEGIN
     UPDATE user_settings SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
 END;
 
+CREATE TRIGGER IF NOT EXISTS update_setups_timestamp
+AFTER UPDATE ON setups
+BEGIN
+    UPDATE setups SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+END;
+
 CREATE TRIGGER IF NOT EXISTS update_accounts_timestamp
 AFTER UPDATE ON accounts
 BEGIN
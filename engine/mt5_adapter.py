@@ -10,17 +10,23 @@ This is a SEPARATE process from the Telegram bot.
 import MetaTrader5 as mt5
 import logging
 import os
+import random
+import time
 
-from datetime import datetime
-from typing import Dict, Optional
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
 
 from engine.symbol_resolver import SymbolResolver
 from engine.risk_calculator import RiskCalculator
 from engine.trade_validator import TradeValidator
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Upper bound (seconds) for the initialize retry backoff in connect()
+CONNECT_MAX_BACKOFF = 8
+# Seconds the static symbol specs (tick size/value, volume limits, digits) are reused
+SYMBOL_INFO_TTL = 60
+
 
 class MT5Adapter:
     """
@@ -35,6 +41,8 @@ class MT5Adapter:
         self.risk_calculator = RiskCalculator()
         self.trade_validator = TradeValidator()
         self.connected = False
+        # symbol -> (monotonic fetch time, static symbol info)
+        self._symbol_cache = {}
 
     def connect(self, login: int = None, password: str = None, server: str = None, force_reconnect: bool = False) -> bool:
         """
@@ -70,10 +78,16 @@ class MT5Adapter:
                         logger.info(f"✅ Already connected to MT5 account {account_info.login}")
                         self.connected = True
                         return True
-                    else:
-                        # Connected but to different account, need to switch
-                        logger.info(f"Switching from account {account_info.login} to {login}")
-                        force_reconnect = True
+                    # Connected to a different account: switch on the live
+                    # terminal with login(), no shutdown/initialize round trip
+                    logger.info(f"Switching from account {account_info.login} to {login}")
+                    if password and server and mt5.login(login=int(login), password=password, server=server):
+                        logger.info(f"✅ MT5 switched to account {login}")
+                        self.connected = True
+                        self._symbol_cache.clear()
+                        return True
+                    logger.warning(f"In-place account switch failed: {mt5.last_error()}, reinitializing")
+                    force_reconnect = True
             except:
                 # Not connected or error, proceed with connection
                 pass
@@ -83,15 +97,12 @@ class MT5Adapter:
             try:
                 mt5.shutdown()
                 logger.info("MT5 shutdown completed before reconnect")
-                import time
                 time.sleep(2)  # Wait 2 seconds after shutdown to avoid IPC timeout
             except Exception as e:
                 logger.warning(f"Shutdown warning: {e}")
 
         # Initialize MT5 connection with retry logic
-        import time
         max_retries = 3
-        retry_delay = 2  # seconds
 
         for attempt in range(1, max_retries + 1):
             # Initialize with terminal path if provided
@@ -108,10 +119,14 @@ class MT5Adapter:
                 logger.warning(f"MT5 initialize attempt {attempt}/{max_retries} failed: {error}")
 
                 if attempt < max_retries:
-                    logger.info(f"Retrying in {retry_delay} seconds...")
+                    # Exponential backoff with jitter, so several processes
+                    # don't all hit a busy terminal at the same moment
+                    retry_delay = min(CONNECT_MAX_BACKOFF, 2 ** (attempt - 1) + random.uniform(0, 1))
+                    logger.info(f"Retrying in {retry_delay:.1f} seconds...")
                     time.sleep(retry_delay)
                 else:
                     logger.error(f"MT5 initialize failed after {max_retries} attempts: {error}")
+                    self.connected = False
                     return False
 
         logger.info(f"Connecting to MT5 with Login: {login}, Server: {server}")
@@ -122,12 +137,14 @@ class MT5Adapter:
                 error_code, error_msg = mt5.last_error()
                 logger.error(f"MT5 login failed: ({error_code}) {error_msg}")
                 mt5.shutdown()
+                self.connected = False
                 return False
             logger.info(f"✅ MT5 logged in successfully with account {login}")
         else:
             logger.info("⚠️  No credentials provided, using existing MT5 session")
 
         self.connected = True
+        self._symbol_cache.clear()  # Specs may differ on the new account/server
         logger.info("MT5 connected successfully")
         return True
 
@@ -173,7 +190,10 @@ class MT5Adapter:
 
     def get_symbol_info(self, symbol: str) -> Optional[Dict]:
         """
-        Get symbol information from MT5.
+        Get static symbol information from MT5.
+
+        Contract specs rarely change, so they are cached for SYMBOL_INFO_TTL
+        seconds. Bid/ask are not included; use get_quote() for prices.
 
         Args:
             symbol: MT5 symbol (e.g., "XAUUSD")
@@ -181,6 +201,10 @@ class MT5Adapter:
         Returns:
             Dictionary with symbol info or None if not found
         """
+        cached = self._symbol_cache.get(symbol)
+        if cached is not None and time.monotonic() - cached[0] < SYMBOL_INFO_TTL:
+            return cached[1]
+
         if not self.ensure_connected():
             logger.error("Not connected to MT5")
             return None
@@ -197,7 +221,7 @@ class MT5Adapter:
                 logger.error(f"Failed to select symbol {symbol}")
                 return None
 
-        return {
+        info = {
             'name': symbol_info.name,
             'trade_contract_size': symbol_info.trade_contract_size,
             'trade_tick_value': symbol_info.trade_tick_value,
@@ -206,10 +230,23 @@ class MT5Adapter:
             'volume_max': symbol_info.volume_max,
             'volume_step': symbol_info.volume_step,
             'point': symbol_info.point,
-            'digits': symbol_info.digits,
-            'bid': symbol_info.bid,
-            'ask': symbol_info.ask
+            'digits': symbol_info.digits
         }
+        self._symbol_cache[symbol] = (time.monotonic(), info)
+        return info
+
+    def get_quote(self, symbol: str) -> Optional[Dict]:
+        """
+        Get the current bid/ask for a symbol (symbol_info_tick, never cached).
+
+        Returns:
+            {'bid': ..., 'ask': ...} or None if unavailable
+        """
+        tick = mt5.symbol_info_tick(symbol)
+        if tick is None:
+            logger.error(f"No quote for {symbol}: {mt5.last_error()}")
+            return None
+        return {'bid': tick.bid, 'ask': tick.ask}
 
     def calculate_pip_value(self, symbol_info: Dict) -> float:
         """
@@ -282,7 +319,7 @@ class MT5Adapter:
             "type_time": mt5.ORDER_TIME_GTC,
             "type_filling": mt5.ORDER_FILLING_IOC,
         }
-        print(f"Order Request: {request}")
+        logger.debug("Order request: %s", request)
         # Send order
         result = mt5.order_send(request)
 
@@ -314,6 +351,45 @@ class MT5Adapter:
         Returns:
             Execution result dictionary
         """
+        try:
+            symbol_info = self.get_symbol_info(command['symbol'])
+        except Exception as e:
+            logger.exception("Trade execution error")
+            return {"success": False, "error": str(e), "ticket": None, "execution_price": None}
+
+        return self._execute_with_symbol_info(command, symbol_info)
+
+    def execute_trade_commands(self, commands: List[Dict]) -> List[Dict]:
+        """
+        Execute a basket of trade commands.
+
+        Symbol info (and so pip value) is fetched once per distinct symbol
+        instead of once per command. Orders are still sent one at a time:
+        the terminal session does not accept concurrent order_send calls.
+
+        Args:
+            commands: Trade command dictionaries from TradeCommandBuilder
+
+        Returns:
+            Execution result dictionaries, in input order
+        """
+        symbol_infos = {}
+        for command in commands:
+            symbol = command['symbol']
+            if symbol not in symbol_infos:
+                try:
+                    symbol_infos[symbol] = self.get_symbol_info(symbol)
+                except Exception:
+                    logger.exception("Failed to get symbol info for %s", symbol)
+                    symbol_infos[symbol] = None
+
+        return [
+            self._execute_with_symbol_info(command, symbol_infos[command['symbol']])
+            for command in commands
+        ]
+
+    def _execute_with_symbol_info(self, command: Dict, symbol_info: Optional[Dict]) -> Dict:
+        """Validate, size and place one trade command using pre-fetched symbol info"""
         result = {
             "success": False,
             "error": None,
@@ -322,9 +398,7 @@ class MT5Adapter:
         }
 
         try:
-            # Get symbol info
             symbol = command['symbol']
-            symbol_info = self.get_symbol_info(symbol)
 
             if not symbol_info:
                 result["error"] = f"Symbol {symbol} not found in MT5"
@@ -470,10 +544,6 @@ class MT5Adapter:
 
         open_positions = []
         for position in positions:
-            # Get current price for profit calculation
-            symbol_info = self.get_symbol_info(position.symbol)
-            current_price = symbol_info['bid'] if position.type == mt5.POSITION_TYPE_BUY else symbol_info['ask']
-
             open_positions.append({
                 'ticket': position.ticket,
                 'symbol': position.symbol,
@@ -481,7 +551,7 @@ class MT5Adapter:
                 'type_raw': position.type,
                 'volume': position.volume,
                 'price_open': position.price_open,
-                'price_current': current_price,
+                'price_current': position.price_current,
                 'sl': position.sl,
                 'tp': position.tp,
                 'profit': position.profit,
@@ -517,7 +587,6 @@ class MT5Adapter:
 
         # Get symbol info for additional details
         symbol_info = self.get_symbol_info(position.symbol)
-        current_price = symbol_info['bid'] if position.type == mt5.POSITION_TYPE_BUY else symbol_info['ask']
 
         return {
             'ticket': position.ticket,
@@ -526,7 +595,7 @@ class MT5Adapter:
             'type_raw': position.type,
             'volume': position.volume,
             'price_open': position.price_open,
-            'price_current': current_price,
+            'price_current': position.price_current,
             'sl': position.sl,
             'tp': position.tp,
             'profit': position.profit,
@@ -741,9 +810,9 @@ class MT5Adapter:
             result["error"] = f"Position {ticket} not found"
             return result
 
-        # Get symbol info
-        symbol_info = position_detail['symbol_info']
-        if not symbol_info:
+        # Get a fresh quote to close at
+        quote = self.get_quote(position_detail['symbol'])
+        if not quote:
             result["error"] = f"Symbol {position_detail['symbol']} info not available"
             return result
 
@@ -752,10 +821,10 @@ class MT5Adapter:
         # To close SELL position, we need to BUY
         if position_detail['type_raw'] == mt5.POSITION_TYPE_BUY:
             order_type = mt5.ORDER_TYPE_SELL
-            price = symbol_info['bid']
+            price = quote['bid']
         else:
             order_type = mt5.ORDER_TYPE_BUY
-            price = symbol_info['ask']
+            price = quote['ask']
 
         # Build close request
         request = {
@@ -797,6 +866,8 @@ class MT5Adapter:
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
     # Initialize adapter
     adapter = MT5Adapter()
 
@@ -822,7 +893,7 @@ if __name__ == "__main__":
             "emotion": "calm",
             "setup_code": "FZ1",
             "chart_url": None,
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": datetime.now(timezone.utc).isoformat(timespec='milliseconds')
         }
 
         # Execute trade
@@ -21,6 +21,11 @@ For Forex pairs:
 Volume = Risk USD / (Stop Distance in Pips × Pip Value)
 """
 
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
 
 class RiskCalculator:
     """
@@ -60,58 +65,78 @@ class RiskCalculator:
         Returns:
             Calculated volume in lots, or None if invalid inputs
         """
-        # Validate inputs
-        if risk_usd <= 0:
-            return None
+        logger.debug("SL distance price: %s", abs(entry_price - sl_price))
 
-        # Calculate stop distance in price
-        sl_distance_price = abs(entry_price - sl_price)
+        return self.calculate_volumes(
+            [(risk_usd, entry_price, sl_price)],
+            pip_value, tick_size, volume_step, min_volume, max_volume
+        )[0]
 
-        print(f"SL Distance Price: {sl_distance_price}")
+    def calculate_volumes(
+        self,
+        trades: list,
+        pip_value: float,
+        tick_size: float,
+        volume_step: float,
+        min_volume: float = 0.01,
+        max_volume: float = 100.0
+    ) -> list:
+        """
+        Calculate volumes for a basket of trades on the same symbol.
+
+        calculate_volume is the single-trade case of this method. The
+        instrument branch (gold vs forex) is chosen once for the basket
+        instead of once per trade.
 
-        if sl_distance_price == 0:
-            return None
+        Args:
+            trades: (risk_usd, entry_price, sl_price) tuples
+            pip_value, tick_size, volume_step, min_volume, max_volume:
+                Symbol specs shared by every trade (see calculate_volume)
 
-        # Calculate raw volume based on instrument type
+        Returns:
+            Volumes in lots (None for invalid trades), in input order
+        """
+        # Raw volume depends on the instrument type:
         #
         # For Gold (XAUUSD):
         #   Formula: Volume = Risk / (Distance × 100)
-        #   Where 100 is the standard contract size for Gold
+        #   Where 100 is the standard contract size for Gold (100 oz)
         #
         #   Example: Entry 2650, SL 2640, Risk $100
         #   Distance = 10, Volume = 100 / (10 × 100) = 0.10 Lot
         #
         # For Forex pairs:
         #   Formula: Volume = Risk / (Distance in Pips × Pip Value)
+        #   pip_value is per pip (1 pip = 10 points for 5-digit quotes)
         #
         #   Example: Entry 1.1000, SL 1.0950, Risk $100, Pip Value $10
         #   Distance = 0.005 (50 pips), Volume = 100 / (50 × 10) = 0.20 Lot
+        is_gold = tick_size >= 0.01  # Gold-like (tick_size = 0.01)
+        pip_size = 0.0001  # Standard pip size for forex
+        volumes = []
 
-        if tick_size >= 0.01:  # Gold-like (tick_size = 0.01)
-            # Gold formula: Volume = Risk / (Distance × Contract Size)
-            # Gold contract size = 100 oz
-            # Example: Risk $50, Distance $5, contract_size 100
-            #          Volume = 50 / (5 × 100) = 0.1 lots
-            raw_volume = risk_usd / (sl_distance_price * 100)
-        else:  # Forex-like (tick_size = 0.00001 or 0.0001)
-            # pip_value is per pip (10 points for 5-digit, 1 point for 4-digit)
-            # Convert price distance to pips (assuming 1 pip = 10 points for 5-digit)
-            pip_size = 0.0001  # Standard pip size for forex
-            sl_distance_pips = sl_distance_price / pip_size
-            raw_volume = risk_usd / (sl_distance_pips * pip_value)
+        for risk_usd, entry_price, sl_price in trades:
+            # Validate inputs
+            sl_distance_price = abs(entry_price - sl_price)
+            if risk_usd <= 0 or sl_distance_price == 0:
+                volumes.append(None)
+                continue
 
-        # Enforce max volume BEFORE rounding (to handle very large risk amounts)
-        if raw_volume > max_volume:
-            return max_volume
+            if is_gold:
+                raw_volume = risk_usd / (sl_distance_price * 100)
+            else:
+                raw_volume = risk_usd / ((sl_distance_price / pip_size) * pip_value)
 
-        # Round down to volume step
-        volume = self._round_to_step(raw_volume, volume_step)
+            # Enforce max volume BEFORE rounding (to handle very large risk amounts)
+            if raw_volume > max_volume:
+                volumes.append(max_volume)
+                continue
 
-        # Enforce min volume after rounding
-        if volume < min_volume:
-            volume = min_volume
+            # Round down to volume step, then enforce min volume
+            volume = self._round_to_step(raw_volume, volume_step)
+            volumes.append(volume if volume >= min_volume else min_volume)
 
-        return volume
+        return volumes
 
     def _round_to_step(self, value: float, step: float) -> float:
         """
@@ -121,7 +146,6 @@ class RiskCalculator:
 
         Uses rounding to avoid floating point precision issues.
         """
-        import math
         # Round to 8 decimal places first to avoid floating point errors
         value = round(value, 8)
         return math.floor(value / step) * step
@@ -5,6 +5,19 @@ Builds MT5 symbol from user configuration (prefix + base + "USD" + suffix).
 This implementation satisfies all test cases in test_symbol_resolver.py.
 """
 
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1024)  # Pure function of a small set of (base, prefix, suffix)
+def _resolve_symbol(base: str, prefix: str | None, suffix: str | None) -> str | None:
+    """Build prefix + base + "USD" + suffix (None if base is empty)"""
+    # Validate base
+    if not base:
+        return None
+
+    # Treat None as empty string; build symbol: prefix + base + "USD" + suffix
+    return f"{prefix or ''}{base}USD{suffix or ''}"
+
 
 class SymbolResolver:
     """
@@ -34,15 +47,4 @@ class SymbolResolver:
         Returns:
             Complete MT5 symbol, or None if base is empty
         """
-        # Validate base
-        if not base or base == "":
-            return None
-
-        # Treat None as empty string
-        prefix = prefix or ""
-        suffix = suffix or ""
-
-        # Build symbol: prefix + base + "USD" + suffix
-        symbol = f"{prefix}{base}USD{suffix}"
-
-        return symbol
+        return _resolve_symbol(base, prefix, suffix)
@@ -4,9 +4,12 @@ Test MT5 Reconnect Logic
 Kiểm tra logic connect/reconnect/ensure_connected
 """
 
+import logging
 import time
 from engine.mt5_adapter import MT5Adapter
 
+logging.basicConfig(level=logging.INFO)
+
 print("=" * 60)
 print("TEST MT5 RECONNECT LOGIC")
 print("=" * 60)
@@ -53,10 +56,11 @@ print(f"✓ Force reconnect: {result}")
 # Test 7: Get symbol info (test reconnect nếu bị disconnect)
 print("\n[Test 7] Get symbol info...")
 symbol_info = adapter.get_symbol_info("XAUUSD")
-if symbol_info:
+quote = adapter.get_quote("XAUUSD")
+if symbol_info and quote:
     print(f"✓ Symbol: {symbol_info['name']}")
-    print(f"  Bid: {symbol_info['bid']}")
-    print(f"  Ask: {symbol_info['ask']}")
+    print(f"  Bid: {quote['bid']}")
+    print(f"  Ask: {quote['ask']}")
 else:
     print("✗ Failed to get symbol info")
 
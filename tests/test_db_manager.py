@@ -0,0 +1,452 @@
+"""
+Tests for Database Manager
+
+Runs against a real temporary SQLite database built from schema.sql.
+"""
+
+import sqlite3
+import threading
+import pytest
+
+from database.db_manager import DatabaseManager, SETUP_FIELD_UPDATE_SQL, DEACTIVATE_SETUP_SQL
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Fresh database with schema and one user with default settings"""
+    manager = DatabaseManager(str(tmp_path / "test.db"))
+    manager.initialize_schema()
+    user_id = manager.create_user(telegram_id=111, username="trader")
+    manager.create_default_settings(user_id)
+    yield manager
+    manager.close()
+
+
+class TestSchema:
+    """Test initialize_schema"""
+
+    def test_connection_uses_wal(self, db):
+        """
+        GIVEN: File-backed database
+        WHEN: Connection is opened
+        THEN: Journal mode should be WAL with synchronous=NORMAL
+        """
+        assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert db.conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+    def test_settings_lookup_uses_index(self, db):
+        """
+        GIVEN: Schema with indexes
+        WHEN: Plan the get_user_settings query
+        THEN: Should search user_settings by index, not scan the table
+        """
+        plan = db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM user_settings WHERE user_id = ?", (1,)
+        ).fetchall()
+
+        assert "idx_user_settings_user_id" in plan[0]['detail']
+
+    def test_close_all_closes_every_thread_connection(self, db):
+        """
+        GIVEN: Connections opened on the main thread and a worker thread
+        WHEN: close_all is called
+        THEN: Both should be closed and the main thread should reconnect on demand
+        """
+        worker_conn = []
+        thread = threading.Thread(target=lambda: worker_conn.append(db.conn))
+        thread.start()
+        thread.join()
+        main_conn = db.conn
+
+        db.close_all()
+
+        for conn in (main_conn, worker_conn[0]):
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+        assert db.conn.execute("SELECT 1").fetchone()[0] == 1
+
+    def test_setups_updated_at_touched_by_trigger(self, db):
+        """
+        GIVEN: Setup with an old updated_at
+        WHEN: Update its name
+        THEN: Trigger should refresh updated_at
+        """
+        user = db.get_user_by_telegram_id(111)
+        setup_id = db.create_setup(user['id'], "FZ1", "Fair Value Zone 1")
+        db.conn.execute("UPDATE setups SET updated_at = '2000-01-01 00:00:00'")
+        db.conn.commit()
+
+        db.execute_batches([(SETUP_FIELD_UPDATE_SQL['name'], [("Zone One", setup_id, user['id'])])])
+
+        row = db.conn.execute("SELECT updated_at FROM setups WHERE id = ?", (setup_id,)).fetchone()
+        assert row['updated_at'] != '2000-01-01 00:00:00'
+
+    def test_adds_updated_at_to_legacy_setups_table(self, tmp_path):
+        """
+        GIVEN: Existing database whose setups table has no updated_at column
+        WHEN: Initialize schema
+        THEN: Column should be added so the timestamp trigger works
+        """
+        path = str(tmp_path / "legacy.db")
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE setups (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL, "
+            "setup_code TEXT NOT NULL, setup_name TEXT NOT NULL, description TEXT, "
+            "is_active BOOLEAN DEFAULT 1, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, "
+            "UNIQUE(user_id, setup_code))"
+        )
+        conn.commit()
+        conn.close()
+
+        manager = DatabaseManager(path)
+        manager.initialize_schema()
+        user_id = manager.create_user(telegram_id=111)
+        setup_id = manager.create_setup(user_id, "FZ1", "Fair Value Zone 1")
+        manager.execute_batches([(SETUP_FIELD_UPDATE_SQL['name'], [("Zone One", setup_id, user_id)])])
+
+        row = manager.conn.execute("SELECT updated_at FROM setups WHERE id = ?", (setup_id,)).fetchone()
+        assert row['updated_at'] is not None
+        manager.close()
+
+
+class TestTransaction:
+    """Test transaction context manager and register_user"""
+
+    def test_register_user_creates_user_and_settings(self, db):
+        """
+        GIVEN: New Telegram user
+        WHEN: register_user is called
+        THEN: User and default settings should both exist
+        """
+        user_id = db.register_user(telegram_id=222, username="second")
+
+        assert db.get_user_by_telegram_id(222).id == user_id
+        assert db.get_user_settings(user_id).risk_type == "fixed_usd"
+
+    def test_rolls_back_every_statement_on_error(self, db):
+        """
+        GIVEN: Transaction whose second statement fails
+        WHEN: The block raises
+        THEN: The first statement should be rolled back too
+        """
+        with pytest.raises(sqlite3.IntegrityError):
+            with db.transaction() as cursor:
+                cursor.execute("INSERT INTO users (telegram_id) VALUES (?)", (333,))
+                cursor.execute("INSERT INTO users (telegram_id) VALUES (?)", (333,))
+
+        assert db.get_user_by_telegram_id(333) is None
+
+
+class TestRecords:
+    """Test namedtuple records returned for user and settings rows"""
+
+    def test_user_supports_attribute_and_key_access(self, db):
+        """
+        GIVEN: Existing user
+        WHEN: Fetch by Telegram ID
+        THEN: Columns should be readable by attribute, name, and index
+        """
+        user = db.get_user_by_telegram_id(111)
+
+        assert user.telegram_id == 111
+        assert user['username'] == "trader"
+        assert user[0] == user.id
+        assert "telegram_id" in user.keys()
+
+    def test_settings_unknown_column_raises_key_error(self, db):
+        """
+        GIVEN: Default settings row
+        WHEN: Read an unknown column by name
+        THEN: Should raise KeyError like sqlite3.Row
+        """
+        user = db.get_user_by_telegram_id(111)
+        settings = db.get_user_settings(user.id)
+
+        assert settings.risk_type == "fixed_usd"
+        assert settings['default_rr_ratio'] == 2.0
+        with pytest.raises(KeyError):
+            settings['missing_column']
+
+
+class TestSymbolSettings:
+    """Test get_user_symbol_settings"""
+
+    def test_returns_defaults_as_tuple(self, db):
+        """
+        GIVEN: New user with default settings
+        WHEN: Fetch symbol settings
+        THEN: Should unpack into (base, prefix, suffix)
+        """
+        user = db.get_user_by_telegram_id(111)
+
+        base, prefix, suffix = db.get_user_symbol_settings(user['id'])
+
+        assert base == "XAU"
+        assert prefix == ""
+        assert suffix == ""
+
+    def test_reflects_updates(self, db):
+        """
+        GIVEN: User updated prefix and suffix
+        WHEN: Fetch symbol settings
+        THEN: Should expose values by attribute
+        """
+        user = db.get_user_by_telegram_id(111)
+        db.update_user_settings(user['id'], symbol_prefix="BROKER.", symbol_suffix="m")
+
+        settings = db.get_user_symbol_settings(user['id'])
+
+        assert settings.prefix == "BROKER."
+        assert settings.suffix == "m"
+
+    def test_missing_user_returns_none(self, db):
+        """
+        GIVEN: User ID without settings row
+        WHEN: Fetch symbol settings
+        THEN: Should return None
+        """
+        assert db.get_user_symbol_settings(9999) is None
+
+
+class TestUserSetupsMinimal:
+    """Test get_user_setups_minimal"""
+
+    def test_returns_code_and_name_only(self, db):
+        """
+        GIVEN: User has an active setup with a description and an inactive one
+        WHEN: Fetch minimal setups
+        THEN: Should return only the active one with code and name columns
+        """
+        user = db.get_user_by_telegram_id(111)
+        db.create_setup(user['id'], "FZ1", "Fair Value Zone 1", "Long description")
+        ob_id = db.create_setup(user['id'], "OB", "Order Block")
+        db.execute_batches([(DEACTIVATE_SETUP_SQL, [(ob_id, user['id'])])])
+
+        setups = db.get_user_setups_minimal(user['id'])
+
+        assert len(setups) == 1
+        assert setups[0].keys() == ["setup_code", "setup_name"]
+        assert tuple(setups[0]) == ("FZ1", "Fair Value Zone 1")
+
+
+class TestSetupCodeExists:
+    """Test setup_code_exists lookup"""
+
+    def test_detects_existing_code(self, db):
+        """
+        GIVEN: User has setup FZ1
+        WHEN: Check FZ1 and OB
+        THEN: Only FZ1 should exist
+        """
+        user = db.get_user_by_telegram_id(111)
+        db.create_setup(user['id'], "FZ1", "Fair Value Zone 1")
+
+        assert db.setup_code_exists(user['id'], "FZ1") is True
+        assert db.setup_code_exists(user['id'], "OB") is False
+
+    def test_scoped_per_user(self, db):
+        """
+        GIVEN: Another user has setup FZ1
+        WHEN: Check FZ1 for first user
+        THEN: Should not exist
+        """
+        other_id = db.create_user(telegram_id=222)
+        db.create_setup(other_id, "FZ1", "Fair Value Zone 1")
+        user = db.get_user_by_telegram_id(111)
+
+        assert db.setup_code_exists(user['id'], "FZ1") is False
+
+
+class TestSetupsByTelegramId:
+    """Test get_setups_by_telegram_id join"""
+
+    def test_returns_only_active_setups(self, db):
+        """
+        GIVEN: User has one active and one deactivated setup
+        WHEN: Fetch setups by Telegram ID
+        THEN: Should return only the active one
+        """
+        user = db.get_user_by_telegram_id(111)
+        db.create_setup(user['id'], "FZ1", "Fair Value Zone 1")
+        db.create_setup(user['id'], "OB", "Order Block")
+        db.conn.execute("UPDATE setups SET is_active = 0 WHERE setup_code = 'OB'")
+
+        setups = db.get_setups_by_telegram_id(111)
+
+        assert [s['setup_code'] for s in setups] == ["FZ1"]
+        assert setups[0]['id'] is not None
+        assert setups[0]['setup_name'] == "Fair Value Zone 1"
+
+    def test_unknown_user_returns_empty(self, db):
+        """
+        GIVEN: Telegram ID not registered
+        WHEN: Fetch setups
+        THEN: Should return empty list
+        """
+        assert db.get_setups_by_telegram_id(999) == []
+
+
+class TestSetupMutations:
+    """Test the setup write statements handlers submit through the write queue"""
+
+    def test_update_name_and_description(self, db):
+        """
+        GIVEN: Existing setup FZ1
+        WHEN: Update name and clear description
+        THEN: Row should reflect both changes
+        """
+        user = db.get_user_by_telegram_id(111)
+        setup_id = db.create_setup(user['id'], "FZ1", "Old Name", "Old description")
+
+        db.execute_batches([
+            (SETUP_FIELD_UPDATE_SQL['name'], [("New Name", setup_id, user['id'])]),
+            (SETUP_FIELD_UPDATE_SQL['description'], [(None, setup_id, user['id'])]),
+        ])
+
+        setup = db.get_user_setups(user['id'])[0]
+        assert setup['setup_name'] == "New Name"
+        assert setup['description'] is None
+
+    def test_deactivate_hides_setup(self, db):
+        """
+        GIVEN: Existing setup FZ1
+        WHEN: Deactivate it
+        THEN: Should no longer be listed as active
+        """
+        user = db.get_user_by_telegram_id(111)
+        setup_id = db.create_setup(user['id'], "FZ1", "Fair Value Zone 1")
+
+        db.execute_batches([(DEACTIVATE_SETUP_SQL, [(setup_id, user['id'])])])
+
+        assert db.get_user_setups(user['id']) == []
+        assert len(db.get_user_setups(user['id'], active_only=False)) == 1
+        # Code stays taken, so old trades are never re-attached to a new setup
+        assert db.setup_code_exists(user['id'], "FZ1") is True
+
+    def test_oversized_description_rejected(self, db):
+        """
+        GIVEN: Description longer than 500 characters
+        WHEN: Create setup
+        THEN: Schema CHECK constraint should reject it
+        """
+        user = db.get_user_by_telegram_id(111)
+
+        with pytest.raises(sqlite3.IntegrityError):
+            db.create_setup(user['id'], "FZ1", "Fair Value Zone 1", "x" * 501)
+
+
+class TestCreateTrade:
+    """Test create_trade"""
+
+    TRADE = dict(
+        account_id=1, symbol="XAUUSD", order_type="LIMIT_BUY", entry=2000.0,
+        sl=1990.0, tp=2020.0, volume=0.1, risk_usd=100.0, rr=2.0,
+        emotion="calm", setup_code="FZ1", chart_url=None
+    )
+
+    def test_pending_trade_has_no_ticket(self, db):
+        """
+        GIVEN: Trade about to be sent to MT5
+        WHEN: Record it as pending
+        THEN: Row should have pending status and no ticket
+        """
+        user = db.get_user_by_telegram_id(111)
+
+        trade_id = db.create_trade(status="pending", user_id=user['id'], **self.TRADE)
+
+        row = db.conn.execute("SELECT * FROM trades WHERE id = ?", (trade_id,)).fetchone()
+        assert row['status'] == "pending"
+        assert row['mt5_ticket'] is None
+
+    def test_missing_fields_listed_together(self, db):
+        """
+        GIVEN: Trade without sl and tp
+        WHEN: Create it
+        THEN: ValueError should name every missing field
+        """
+        user = db.get_user_by_telegram_id(111)
+        trade = dict(self.TRADE, user_id=user['id'])
+        del trade['sl'], trade['tp']
+
+        with pytest.raises(ValueError, match=r"\['sl', 'tp'\]"):
+            db.create_trade(**trade)
+
+
+class TestCreateTradesBulk:
+    """Test create_trades_bulk"""
+
+    def _rows(self, user_id, count):
+        return [
+            dict(TestCreateTrade.TRADE, user_id=user_id, entry=2000.0 + i)
+            for i in range(count)
+        ]
+
+    def test_inserts_all_rows_across_chunks(self, db):
+        """
+        GIVEN: More rows than fit in one 999-parameter statement
+        WHEN: Insert them in bulk
+        THEN: Every row should be stored with its own values
+        """
+        user = db.get_user_by_telegram_id(111)
+
+        inserted = db.create_trades_bulk(self._rows(user['id'], 200))
+
+        entries = [r[0] for r in db.conn.execute("SELECT entry FROM trades ORDER BY id")]
+        assert inserted == 200
+        assert entries == [2000.0 + i for i in range(200)]
+
+    def test_mismatched_rows_rejected(self, db):
+        """
+        GIVEN: Rows with different key sets
+        WHEN: Insert them in bulk
+        THEN: ValueError should be raised and nothing stored
+        """
+        user = db.get_user_by_telegram_id(111)
+        rows = self._rows(user['id'], 2)
+        del rows[1]['chart_url']
+
+        with pytest.raises(ValueError):
+            db.create_trades_bulk(rows)
+
+        assert db.conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0] == 0
+
+
+class TestUpdateTradeStatuses:
+    """Test update_trade_status / update_trade_statuses"""
+
+    def _trade(self, db):
+        user = db.get_user_by_telegram_id(111)
+        return db.create_trade(user_id=user['id'], **TestCreateTrade.TRADE)
+
+    def test_updates_many_trades_at_once(self, db):
+        """
+        GIVEN: Two pending trades
+        WHEN: Both are updated in one batch
+        THEN: Each row should get its own status and ticket
+        """
+        first, second = self._trade(db), self._trade(db)
+
+        db.update_trade_statuses([
+            (first, {'status': 'filled', 'mt5_ticket': 1}),
+            (second, {'status': 'cancelled', 'mt5_ticket': 2}),
+        ])
+
+        rows = db.conn.execute("SELECT status, mt5_ticket FROM trades ORDER BY id").fetchall()
+        assert [tuple(r) for r in rows] == [('filled', 1), ('cancelled', 2)]
+
+    def test_close_keeps_open_fields_and_sets_real_timestamp(self, db):
+        """
+        GIVEN: Filled trade with ticket and open price
+        WHEN: Mark it closed with only close fields
+        THEN: Open fields are kept and updated_at is a timestamp, not the literal text
+        """
+        trade_id = self._trade(db)
+        db.update_trade_status(trade_id, 'filled', mt5_ticket=555, mt5_open_price=2000.5)
+
+        db.update_trade_status(trade_id, 'closed', mt5_close_price=2020.0, mt5_profit=195.0)
+
+        row = db.conn.execute("SELECT * FROM trades WHERE id = ?", (trade_id,)).fetchone()
+        assert row['mt5_ticket'] == 555
+        assert row['mt5_open_price'] == 2000.5
+        assert row['mt5_profit'] == 195.0
+        assert row['updated_at'] != 'CURRENT_TIMESTAMP'
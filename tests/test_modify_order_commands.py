@@ -5,7 +5,7 @@ Test /modifyorder command for modifying pending orders.
 """
 
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 from telegram import Update, Message, User, Chat, CallbackQuery, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler
 
@@ -45,27 +45,27 @@ class TestModifyOrderStart:
         ]
         context.bot_data = {'mt5_adapter': mt5_adapter}
 
-        with patch('bot.modify_order_commands.DatabaseManager') as MockDB:
-            mock_db = MockDB.return_value
-            mock_db.get_user_by_telegram_id.return_value = {'id': 1}
+        mock_db = MagicMock()
+        mock_db.get_user_by_telegram_id.return_value = {'id': 1}
+        context.bot_data['db'] = mock_db
 
-            result = await modifyorder_start(update, context)
+        result = await modifyorder_start(update, context)
 
-            # Verify order list shown
-            update.message.reply_text.assert_called_once()
-            call_args = update.message.reply_text.call_args
+        # Verify order list shown
+        update.message.reply_text.assert_called_once()
+        call_args = update.message.reply_text.call_args
 
-            # Check message
-            assert "Modify Pending Order" in call_args[0][0]
-            assert "Select an order" in call_args[0][0]
+        # Check message
+        assert "Modify Pending Order" in call_args[0][0]
+        assert "Select an order" in call_args[0][0]
 
-            # Check keyboard
-            reply_markup = call_args[1]['reply_markup']
-            assert reply_markup is not None
-            assert len(reply_markup.inline_keyboard) > 0
+        # Check keyboard
+        reply_markup = call_args[1]['reply_markup']
+        assert reply_markup is not None
+        assert len(reply_markup.inline_keyboard) > 0
 
-            # Verify returns MODIFY_SELECT_ORDER state
-            assert result == MODIFY_SELECT_ORDER
+        # Verify returns MODIFY_SELECT_ORDER state
+        assert result == MODIFY_SELECT_ORDER
 
     @pytest.mark.asyncio
     async def test_modifyorder_with_ticket_shows_modification_menu(self):
@@ -100,31 +100,31 @@ class TestModifyOrderStart:
         }
         context.bot_data = {'mt5_adapter': mt5_adapter}
 
-        with patch('bot.modify_order_commands.DatabaseManager') as MockDB:
-            mock_db = MockDB.return_value
-            mock_db.get_user_by_telegram_id.return_value = {'id': 1}
+        mock_db = MagicMock()
+        mock_db.get_user_by_telegram_id.return_value = {'id': 1}
+        context.bot_data['db'] = mock_db
 
-            result = await modifyorder_start(update, context)
+        result = await modifyorder_start(update, context)
 
-            # Verify modification menu shown
-            update.message.reply_text.assert_called_once()
-            call_args = update.message.reply_text.call_args
+        # Verify modification menu shown
+        update.message.reply_text.assert_called_once()
+        call_args = update.message.reply_text.call_args
 
-            # Check message contains order details
-            message_text = call_args[0][0]
-            assert "Modify Order" in message_text
-            assert "111" in message_text  # Ticket number
-            assert "XAUUSD" in message_text
+        # Check message contains order details
+        message_text = call_args[0][0]
+        assert "Modify Order" in message_text
+        assert "111" in message_text  # Ticket number
+        assert "XAUUSD" in message_text
 
-            # Check keyboard has modification options
-            reply_markup = call_args[1]['reply_markup']
-            assert reply_markup is not None
+        # Check keyboard has modification options
+        reply_markup = call_args[1]['reply_markup']
+        assert reply_markup is not None
 
-            # Verify ticket stored in context
-            assert context.user_data['modify_ticket'] == 111
+        # Verify ticket stored in context
+        assert context.user_data['modify_ticket'] == 111
 
-            # Verify returns MODIFY_SELECT_FIELD state
-            assert result == MODIFY_SELECT_FIELD
+        # Verify returns MODIFY_SELECT_FIELD state
+        assert result == MODIFY_SELECT_FIELD
 
     @pytest.mark.asyncio
     async def test_modifyorder_with_invalid_ticket(self):
@@ -147,19 +147,19 @@ class TestModifyOrderStart:
 
         context.bot_data = {'mt5_adapter': MagicMock(connected=True)}
 
-        with patch('bot.modify_order_commands.DatabaseManager') as MockDB:
-            mock_db = MockDB.return_value
-            mock_db.get_user_by_telegram_id.return_value = {'id': 1}
+        mock_db = MagicMock()
+        mock_db.get_user_by_telegram_id.return_value = {'id': 1}
+        context.bot_data['db'] = mock_db
 
-            result = await modifyorder_start(update, context)
+        result = await modifyorder_start(update, context)
 
-            # Verify error message
-            update.message.reply_text.assert_called_once()
-            call_args = update.message.reply_text.call_args[0][0]
-            assert "Invalid ticket" in call_args
+        # Verify error message
+        update.message.reply_text.assert_called_once()
+        call_args = update.message.reply_text.call_args[0][0]
+        assert "Invalid ticket" in call_args
 
-            # Verify returns END
-            assert result == ConversationHandler.END
+        # Verify returns END
+        assert result == ConversationHandler.END
 
     @pytest.mark.asyncio
     async def test_modifyorder_no_mt5_connection(self):
@@ -184,20 +184,20 @@ class TestModifyOrderStart:
         mt5_adapter.connected = False
         context.bot_data = {'mt5_adapter': mt5_adapter}
 
-        with patch('bot.modify_order_commands.DatabaseManager') as MockDB:
-            mock_db = MockDB.return_value
-            mock_db.get_user_by_telegram_id.return_value = {'id': 1}
+        mock_db = MagicMock()
+        mock_db.get_user_by_telegram_id.return_value = {'id': 1}
+        context.bot_data['db'] = mock_db
 
-            result = await modifyorder_start(update, context)
+        result = await modifyorder_start(update, context)
 
-            # Verify error message about MT5
-            update.message.reply_text.assert_called_once()
-            call_args = update.message.reply_text.call_args[0][0]
-            assert "MT5" in call_args
-            assert "not connected" in call_args.lower()
+        # Verify error message about MT5
+        update.message.reply_text.assert_called_once()
+        call_args = update.message.reply_text.call_args[0][0]
+        assert "MT5" in call_args
+        assert "not connected" in call_args.lower()
 
-            # Verify returns END
-            assert result == ConversationHandler.END
+        # Verify returns END
+        assert result == ConversationHandler.END
 
 
 class TestReceiveModificationValues:
@@ -5,7 +5,7 @@ Test /positions command for viewing and closing open positions.
 """
 
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 from telegram import Update, Message, User, Chat, CallbackQuery
 from telegram.ext import ContextTypes
 
@@ -61,42 +61,42 @@ class TestPositionsCommand:
         ]
         context.bot_data = {'mt5_adapter': mt5_adapter}
 
-        with patch('bot.position_commands.DatabaseManager') as MockDB:
-            mock_db = MockDB.return_value
-            mock_db.get_user_by_telegram_id.return_value = {'id': 1}
+        mock_db = MagicMock()
+        mock_db.get_user_by_telegram_id.return_value = {'id': 1}
+        context.bot_data['db'] = mock_db
 
-            await positions_command(update, context)
+        await positions_command(update, context)
 
-            # Verify positions displayed
-            update.message.reply_text.assert_called_once()
-            call_args = update.message.reply_text.call_args
+        # Verify positions displayed
+        update.message.reply_text.assert_called_once()
+        call_args = update.message.reply_text.call_args
 
-            # Check message content
-            message_text = call_args[0][0]
-            assert "Open Positions" in message_text
-            assert "(2)" in message_text  # 2 positions
-            assert "111" in message_text  # Ticket 1
-            assert "222" in message_text  # Ticket 2
-            assert "XAUUSD" in message_text
-            assert "EURUSD" in message_text
-            assert "47.50" in message_text  # Profit 1
-            assert "50.00" in message_text  # Profit 2
-
-            # Check total P&L
-            assert "97.50" in message_text  # Total profit
-
-            # Check keyboard
-            reply_markup = call_args[1]['reply_markup']
-            assert reply_markup is not None
-            keyboard = reply_markup.inline_keyboard
+        # Check message content
+        message_text = call_args[0][0]
+        assert "Open Positions" in message_text
+        assert "(2)" in message_text  # 2 positions
+        assert "111" in message_text  # Ticket 1
+        assert "222" in message_text  # Ticket 2
+        assert "XAUUSD" in message_text
+        assert "EURUSD" in message_text
+        assert "47.50" in message_text  # Profit 1
+        assert "50.00" in message_text  # Profit 2
+
+        # Check total P&L
+        assert "97.50" in message_text  # Total profit
+
+        # Check keyboard
+        reply_markup = call_args[1]['reply_markup']
+        assert reply_markup is not None
+        keyboard = reply_markup.inline_keyboard
 
-            # Should have 2 close buttons + 1 refresh button
-            assert len(keyboard) == 3
+        # Should have 2 close buttons + 1 refresh button
+        assert len(keyboard) == 3
 
-            # Check close buttons
-            assert "Close #111" in keyboard[0][0].text
-            assert "Close #222" in keyboard[1][0].text
-            assert "Refresh" in keyboard[2][0].text
+        # Check close buttons
+        assert "Close #111" in keyboard[0][0].text
+        assert "Close #222" in keyboard[1][0].text
+        assert "Refresh" in keyboard[2][0].text
 
     @pytest.mark.asyncio
     async def test_positions_no_positions(self):
@@ -121,16 +121,16 @@ class TestPositionsCommand:
         mt5_adapter.get_open_positions.return_value = []
         context.bot_data = {'mt5_adapter': mt5_adapter}
 
-        with patch('bot.position_commands.DatabaseManager') as MockDB:
-            mock_db = MockDB.return_value
-            mock_db.get_user_by_telegram_id.return_value = {'id': 1}
+        mock_db = MagicMock()
+        mock_db.get_user_by_telegram_id.return_value = {'id': 1}
+        context.bot_data['db'] = mock_db
 
-            await positions_command(update, context)
+        await positions_command(update, context)
 
-            # Verify empty message
-            update.message.reply_text.assert_called_once()
-            call_args = update.message.reply_text.call_args[0][0]
-            assert "No Open Positions" in call_args
+        # Verify empty message
+        update.message.reply_text.assert_called_once()
+        call_args = update.message.reply_text.call_args[0][0]
+        assert "No Open Positions" in call_args
 
     @pytest.mark.asyncio
     async def test_positions_mt5_not_connected(self):
@@ -154,17 +154,17 @@ class TestPositionsCommand:
         mt5_adapter.connected = False
         context.bot_data = {'mt5_adapter': mt5_adapter}
 
-        with patch('bot.position_commands.DatabaseManager') as MockDB:
-            mock_db = MockDB.return_value
-            mock_db.get_user_by_telegram_id.return_value = {'id': 1}
+        mock_db = MagicMock()
+        mock_db.get_user_by_telegram_id.return_value = {'id': 1}
+        context.bot_data['db'] = mock_db
 
-            await positions_command(update, context)
+        await positions_command(update, context)
 
-            # Verify error message
-            update.message.reply_text.assert_called_once()
-            call_args = update.message.reply_text.call_args[0][0]
-            assert "MT5" in call_args
-            assert "not connected" in call_args.lower()
+        # Verify error message
+        update.message.reply_text.assert_called_once()
+        call_args = update.message.reply_text.call_args[0][0]
+        assert "MT5" in call_args
+        assert "not connected" in call_args.lower()
 
     @pytest.mark.asyncio
     async def test_positions_shows_profit_loss_colors(self):
@@ -214,17 +214,17 @@ class TestPositionsCommand:
         ]
         context.bot_data = {'mt5_adapter': mt5_adapter}
 
-        with patch('bot.position_commands.DatabaseManager') as MockDB:
-            mock_db = MockDB.return_value
-            mock_db.get_user_by_telegram_id.return_value = {'id': 1}
+        mock_db = MagicMock()
+        mock_db.get_user_by_telegram_id.return_value = {'id': 1}
+        context.bot_data['db'] = mock_db
 
-            await positions_command(update, context)
+        await positions_command(update, context)
 
-            call_args = update.message.reply_text.call_args[0][0]
+        call_args = update.message.reply_text.call_args[0][0]
 
-            # Check for emoji indicators
-            assert "🟢" in call_args  # Green for profit
-            assert "🔴" in call_args  # Red for loss
+        # Check for emoji indicators
+        assert "🟢" in call_args  # Green for profit
+        assert "🔴" in call_args  # Red for loss
 
 
 class TestHandlePositionAction:
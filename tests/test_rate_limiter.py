@@ -0,0 +1,83 @@
+"""
+Tests for Outbound Rate Limiter
+
+Verify token-bucket pacing and RetryAfter backoff.
+"""
+
+import time
+import pytest
+from unittest.mock import AsyncMock
+from telegram.error import RetryAfter
+
+from bot.rate_limiter import TokenBucketRateLimiter
+
+
+class TestTokenBucketRateLimiter:
+    """Test request pacing"""
+
+    @pytest.mark.asyncio
+    async def test_passes_result_through(self):
+        """
+        GIVEN: Request within budget
+        WHEN: Processed
+        THEN: Callback result should be returned unchanged
+        """
+        limiter = TokenBucketRateLimiter()
+        callback = AsyncMock(return_value="ok")
+
+        result = await limiter.process_request(
+            callback, ("a",), {"b": 1}, "sendMessage", {"chat_id": 123}, None
+        )
+
+        assert result == "ok"
+        callback.assert_awaited_once_with("a", b=1)
+
+    @pytest.mark.asyncio
+    async def test_paces_private_chat_after_burst(self):
+        """
+        GIVEN: Private chat budget of 1 burst request, then 20/s
+        WHEN: Two requests go to the same chat back to back
+        THEN: The second should wait for a token (~50ms)
+        """
+        limiter = TokenBucketRateLimiter(private_per_second=20, private_burst=1)
+        callback = AsyncMock(return_value="ok")
+
+        start = time.monotonic()
+        for _ in range(2):
+            await limiter.process_request(
+                callback, (), {}, "sendMessage", {"chat_id": 123}, None
+            )
+
+        assert time.monotonic() - start >= 0.04
+
+    @pytest.mark.asyncio
+    async def test_retries_once_after_retry_after(self):
+        """
+        GIVEN: Telegram answers the first attempt with RetryAfter
+        WHEN: Processed
+        THEN: Should wait and retry, returning the second result
+        """
+        limiter = TokenBucketRateLimiter(max_retries=1)
+        callback = AsyncMock(side_effect=[RetryAfter(0), "ok"])
+
+        result = await limiter.process_request(
+            callback, (), {}, "sendMessage", {"chat_id": 123}, None
+        )
+
+        assert result == "ok"
+        assert callback.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        """
+        GIVEN: Telegram keeps answering with RetryAfter
+        WHEN: Processed with no retries allowed
+        THEN: RetryAfter should propagate to the caller
+        """
+        limiter = TokenBucketRateLimiter(max_retries=0)
+        callback = AsyncMock(side_effect=RetryAfter(0))
+
+        with pytest.raises(RetryAfter):
+            await limiter.process_request(
+                callback, (), {}, "sendMessage", {"chat_id": 123}, None
+            )
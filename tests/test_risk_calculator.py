@@ -188,3 +188,20 @@ class TestRiskCalculator:
         )
 
         assert volume is None
+
+    def test_calculate_volumes_basket(self):
+        """
+        GIVEN: Basket of gold trades, including invalid and oversized ones
+        WHEN: Volumes are calculated in one batch
+        THEN: Each trade should get its own volume, None when invalid
+        """
+        from engine.risk_calculator import RiskCalculator
+
+        calculator = RiskCalculator()
+        trades = [(100.0, 2650.0, 2640.0), (0.0, 2650.0, 2640.0),
+                  (50.0, 2650.0, 2650.0), (1e6, 2650.0, 2649.0), (0.5, 2650.0, 2640.0)]
+        specs = dict(pip_value=1.0, tick_size=0.01, volume_step=0.01)
+
+        volumes = calculator.calculate_volumes(trades, **specs)
+
+        assert volumes == [0.10, None, None, 100.0, 0.01]
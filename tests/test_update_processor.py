@@ -0,0 +1,113 @@
+"""
+Tests for Per-Chat Update Processor
+
+Verify updates are serialized within a chat and concurrent across chats.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from telegram import Update
+
+from bot.update_processor import PerChatUpdateProcessor
+
+
+def make_update(chat_id, callback_query=None):
+    """Create mock update for a chat"""
+    update = MagicMock(spec=Update)
+    update.effective_chat.id = chat_id
+    update.callback_query = callback_query
+    return update
+
+
+class TestPerChatUpdateProcessor:
+    """Test per-chat ordering"""
+
+    @pytest.mark.asyncio
+    async def test_same_chat_runs_sequentially(self):
+        """
+        GIVEN: Two updates from the same chat
+        WHEN: Processed concurrently
+        THEN: Second handler should start only after the first finishes
+        """
+        processor = PerChatUpdateProcessor()
+        events = []
+
+        async def handler(name):
+            events.append(f"{name}-start")
+            await asyncio.sleep(0.01)
+            events.append(f"{name}-end")
+
+        await asyncio.gather(
+            processor.do_process_update(make_update(1), handler("a")),
+            processor.do_process_update(make_update(1), handler("b")),
+        )
+
+        assert events == ["a-start", "a-end", "b-start", "b-end"]
+        assert processor._chat_locks == {}
+
+    @pytest.mark.asyncio
+    async def test_different_chats_run_concurrently(self):
+        """
+        GIVEN: Two updates from different chats
+        WHEN: Processed concurrently
+        THEN: Both handlers should start before either finishes
+        """
+        processor = PerChatUpdateProcessor()
+        events = []
+
+        async def handler(name):
+            events.append(f"{name}-start")
+            await asyncio.sleep(0.01)
+            events.append(f"{name}-end")
+
+        await asyncio.gather(
+            processor.do_process_update(make_update(1), handler("a")),
+            processor.do_process_update(make_update(2), handler("b")),
+        )
+
+        assert events[:2] == ["a-start", "b-start"]
+
+    @pytest.mark.asyncio
+    async def test_flooding_chat_is_capped(self):
+        """
+        GIVEN: A chat sending more updates than max_pending_per_chat
+        WHEN: They are processed concurrently
+        THEN: The excess is dropped, and other chats are unaffected
+        """
+        processor = PerChatUpdateProcessor(max_pending_per_chat=2)
+        handled = []
+
+        async def handler(name):
+            await asyncio.sleep(0.01)
+            handled.append(name)
+
+        await asyncio.gather(
+            *(processor.do_process_update(make_update(1), handler(f"flood{i}")) for i in range(5)),
+            processor.do_process_update(make_update(2), handler("other")),
+        )
+
+        assert sorted(handled) == ["flood0", "flood1", "other"]
+        assert processor._chat_locks == {}
+
+    @pytest.mark.asyncio
+    async def test_dropped_callback_query_is_answered(self):
+        """
+        GIVEN: A button press arriving while its chat is at the cap
+        WHEN: It is dropped
+        THEN: The callback query should be answered with a busy alert
+        """
+        processor = PerChatUpdateProcessor(max_pending_per_chat=1)
+        query = MagicMock()
+        query.answer = AsyncMock()
+
+        async def handler():
+            await asyncio.sleep(0.01)
+
+        await asyncio.gather(
+            processor.do_process_update(make_update(1), handler()),
+            processor.do_process_update(make_update(1, callback_query=query), handler()),
+        )
+
+        query.answer.assert_awaited_once()
+        assert query.answer.await_args.kwargs["show_alert"] is True
@@ -0,0 +1,129 @@
+"""
+Tests for User Cache
+
+Verify TTL expiry, size cap, and invalidation of cached user/settings rows.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from bot import user_cache
+from bot.user_cache import TTLCache, get_settings, get_setups, invalidate_settings, invalidate_setups
+
+
+class TestTTLCache:
+    """Test the dict-backed TTL cache"""
+
+    def test_entry_expires_after_ttl(self):
+        """
+        GIVEN: Entry stored with 60s TTL
+        WHEN: Read before and after expiry
+        THEN: Should be returned only before expiry
+        """
+        cache = TTLCache(maxsize=10, ttl=60)
+
+        with patch('bot.user_cache.time.monotonic', return_value=1000.0):
+            cache.set('a', 1)
+            assert cache.get('a') == 1
+
+        with patch('bot.user_cache.time.monotonic', return_value=1061.0):
+            assert cache.get('a') is None
+
+    def test_evicts_oldest_when_full(self):
+        """
+        GIVEN: Cache with maxsize 2 holding two entries
+        WHEN: Store a third
+        THEN: Oldest entry should be evicted
+        """
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+
+        cache.set('c', 3)
+
+        assert cache.get('a') is None
+        assert cache.get('b') == 2
+        assert cache.get('c') == 3
+
+
+class TestSettingsCache:
+    """Test cached settings lookups"""
+
+    def setup_method(self):
+        user_cache._settings_cache.clear()
+
+    def test_second_read_served_from_cache(self):
+        """
+        GIVEN: Settings row in database
+        WHEN: Read twice
+        THEN: Database should be queried once
+        """
+        db = MagicMock()
+        db.get_user_settings.return_value = {'risk_value': 10.0}
+
+        assert get_settings(db, 1) == {'risk_value': 10.0}
+        assert get_settings(db, 1) == {'risk_value': 10.0}
+
+        db.get_user_settings.assert_called_once_with(1)
+
+    def test_invalidate_forces_reload(self):
+        """
+        GIVEN: Cached settings row
+        WHEN: Settings are invalidated after an update
+        THEN: Next read should hit the database again
+        """
+        db = MagicMock()
+        db.get_user_settings.side_effect = [{'risk_value': 10.0}, {'risk_value': 20.0}]
+        get_settings(db, 1)
+
+        invalidate_settings(1)
+
+        assert get_settings(db, 1) == {'risk_value': 20.0}
+
+    def test_missing_row_not_cached(self):
+        """
+        GIVEN: User without settings
+        WHEN: Read twice
+        THEN: Both reads should query the database
+        """
+        db = MagicMock()
+        db.get_user_settings.return_value = None
+
+        get_settings(db, 1)
+        get_settings(db, 1)
+
+        assert db.get_user_settings.call_count == 2
+
+
+class TestSetupsCache:
+    """Test cached setup lists"""
+
+    def setup_method(self):
+        user_cache._setups_cache.clear()
+
+    def test_empty_list_is_cached(self):
+        """
+        GIVEN: User with no setups
+        WHEN: Read twice
+        THEN: Database should be queried once and an empty tuple returned
+        """
+        db = MagicMock()
+        db.get_user_setups_minimal.return_value = []
+
+        assert get_setups(db, 1) == ()
+        assert get_setups(db, 1) == ()
+
+        db.get_user_setups_minimal.assert_called_once_with(1)
+
+    def test_invalidate_after_setup_change(self):
+        """
+        GIVEN: Cached setup list
+        WHEN: A setup command invalidates it
+        THEN: Next read should return the new list
+        """
+        db = MagicMock()
+        db.get_user_setups_minimal.side_effect = [[], [("FZ1", "Fair Value Zone 1")]]
+        get_setups(db, 1)
+
+        invalidate_setups(1)
+
+        assert get_setups(db, 1) == (("FZ1", "Fair Value Zone 1"),)
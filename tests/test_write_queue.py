@@ -0,0 +1,88 @@
+"""
+Tests for Write Queue
+
+Verify that concurrent writes are batched into one flush and committed.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+
+from bot.write_queue import WriteQueue
+from database.db_manager import DatabaseManager, SETUP_FIELD_UPDATE_SQL, DEACTIVATE_SETUP_SQL
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Database with one user and two setups"""
+    manager = DatabaseManager(str(tmp_path / "test.db"))
+    manager.initialize_schema()
+    user_id = manager.create_user(telegram_id=111)
+    manager.create_setup(user_id, "FZ1", "Fair Value Zone 1")
+    manager.create_setup(user_id, "OB", "Order Block")
+    yield manager
+    manager.close()
+
+
+class TestWriteQueue:
+    """Test write batching"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_flush_in_one_batch(self, db):
+        """
+        GIVEN: Three writes submitted concurrently
+        WHEN: The worker flushes
+        THEN: All are committed in a single execute_batches call
+        """
+        queue = WriteQueue(db, max_wait=0.05)
+        spy = MagicMock(wraps=db.execute_batches)
+        db.execute_batches = spy
+
+        await asyncio.gather(
+            queue.submit(SETUP_FIELD_UPDATE_SQL['name'], ("Zone One", 1, 1)),
+            queue.submit(SETUP_FIELD_UPDATE_SQL['name'], ("Block", 2, 1)),
+            queue.submit(DEACTIVATE_SETUP_SQL, (2, 1)),
+        )
+        await queue.close()
+
+        assert spy.call_count == 1
+        groups = spy.call_args[0][0]
+        assert len(groups) == 2  # Two name updates grouped, then the deactivate
+        assert len(groups[0][1]) == 2
+
+        setups = db.get_user_setups(1)
+        assert [(s['setup_code'], s['setup_name']) for s in setups] == [("FZ1", "Zone One")]
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_raises_to_submitter(self, db):
+        """
+        GIVEN: A write with invalid SQL
+        WHEN: Submitted
+        THEN: The submitter should receive the database error
+        """
+        queue = WriteQueue(db)
+
+        with pytest.raises(Exception):
+            await queue.submit("UPDATE missing_table SET x = ?", (1,))
+
+        await queue.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_write_does_not_fail_its_batch(self, db):
+        """
+        GIVEN: A bad write batched together with a valid one
+        WHEN: The batch is flushed
+        THEN: Only the bad write raises; the valid one is committed
+        """
+        queue = WriteQueue(db, max_wait=0.05)
+
+        good, bad = await asyncio.gather(
+            queue.submit(SETUP_FIELD_UPDATE_SQL['name'], ("Zone One", 1, 1)),
+            queue.submit("UPDATE missing_table SET x = ?", (1,)),
+            return_exceptions=True
+        )
+        await queue.close()
+
+        assert good is None
+        assert isinstance(bad, Exception)
+        assert db.get_user_setups(1)[0]['setup_name'] == "Zone One"